@@ -1,11 +1,17 @@
+import ctypes
+import ctypes.util
 import logging
+import os
 import re
+import selectors
 import socket
 import struct
 import subprocess
+import sys
+import threading
 import time
 import uuid
-from threading import Timer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import quote
 
 import zeroconf
@@ -17,19 +23,103 @@ SHARE_TEMPLATE = '/TiVoConnect?Command=QueryContainer&Container=%s'
 PLATFORM_MAIN = 'pyTivo'
 PLATFORM_VIDEO = 'pc/pyTivo'    # For the nice icon
 
+MACHINE_NAME = re.compile(rb'machine=(.*)\n').search
+
+content_types = {}
+
+def get_content_type(plugin_type):
+    """ The CONTENT_TYPE of a share type's plugin, looked up once. """
+    if plugin_type not in content_types:
+        content_types[plugin_type] = GetPlugin(plugin_type).CONTENT_TYPE
+    return content_types[plugin_type]
+
+# Linux can hand the kernel a whole batch of datagrams in one
+# sendmmsg(2) call; elsewhere we fall back to one sendto() per address.
+
+class _iovec(ctypes.Structure):
+    _fields_ = [('iov_base', ctypes.c_void_p),
+                ('iov_len', ctypes.c_size_t)]
+
+class _msghdr(ctypes.Structure):
+    _fields_ = [('msg_name', ctypes.c_void_p),
+                ('msg_namelen', ctypes.c_uint32),
+                ('msg_iov', ctypes.POINTER(_iovec)),
+                ('msg_iovlen', ctypes.c_size_t),
+                ('msg_control', ctypes.c_void_p),
+                ('msg_controllen', ctypes.c_size_t),
+                ('msg_flags', ctypes.c_int)]
+
+class _mmsghdr(ctypes.Structure):
+    _fields_ = [('msg_hdr', _msghdr),
+                ('msg_len', ctypes.c_uint)]
+
+_libc_sendmmsg = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                            use_errno=True)
+        _libc_sendmmsg = _libc.sendmmsg
+        _libc_sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_mmsghdr),
+                                   ctypes.c_uint, ctypes.c_int]
+        _libc_sendmmsg.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _libc_sendmmsg = None
+
+def _sendmmsg(sock, payload, addrs, port):
+    """ Send payload to each address in addrs with a single sendmmsg()
+        call. Only dotted-quad addresses can be batched; the batch stops
+        at the first one that isn't. Returns the number of leading
+        addresses that were sent to.
+
+    """
+    names = []
+    for ip in addrs:
+        try:
+            packed = socket.inet_aton(ip)
+        except OSError:
+            break
+        names.append(ctypes.create_string_buffer(
+            struct.pack('=H', socket.AF_INET) + struct.pack('!H', port) +
+            packed + bytes(8), 16))
+    count = len(names)
+    if not count:
+        return 0
+
+    buf = ctypes.create_string_buffer(payload, len(payload))
+    iov = _iovec(ctypes.cast(buf, ctypes.c_void_p), len(payload))
+    msgs = (_mmsghdr * count)()
+    for msg, name in zip(msgs, names):
+        msg.msg_hdr.msg_name = ctypes.cast(name, ctypes.c_void_p)
+        msg.msg_hdr.msg_namelen = 16
+        msg.msg_hdr.msg_iov = ctypes.pointer(iov)
+        msg.msg_hdr.msg_iovlen = 1
+
+    result = _libc_sendmmsg(sock.fileno(), msgs, count, 0)
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
 class ZCListener:
-    def __init__(self, names):
+    def __init__(self, names, found=None):
         self.names = names
+        self.found = found
+
+    # The service name always ends with '.' + type, so just slice it off
 
     def removeService(self, server, type, name):
-        self.names.remove(name.replace('.' + type, ''))
+        self.names.remove(name[:-len(type) - 1])
 
     def addService(self, server, type, name):
-        self.names.append(name.replace('.' + type, ''))
+        self.names.append(name[:-len(type) - 1])
+        if self.found:
+            self.found.set()
 
 class ZCBroadcast:
-    def __init__(self, logger):
+    def __init__(self, logger, shares=None):
         """ Announce our shares via Zeroconf. """
+        if shares is None:
+            shares = config.getShares()
         self.share_names = []
         self.share_info = []
         self.logger = logger
@@ -38,10 +128,20 @@ class ZCBroadcast:
         old_titles = self.scan()
         address = socket.inet_aton(config.get_ip())
         port = int(config.getPort())
+
+        # Resolve the short hostname once, rather than once per share
+        append_hostname = config.getAppendHostname()
+        hostname = None
+        if append_hostname:
+            try:
+                hostname = subprocess.check_output(['hostname', '-s'], text=True).strip()
+            except:
+                hostname = socket.gethostname().split('.')[0]
+
         logger.info('Announcing shares...')
-        for section, settings in config.getShares():
+        for section, settings in shares:
             try:
-                ct = GetPlugin(settings['type']).CONTENT_TYPE
+                ct = get_content_type(settings['type'])
             except:
                 continue
             if ct.startswith('x-container/'):
@@ -58,18 +158,14 @@ class ZCBroadcast:
                 
                 # Append hostname to share name if configured
                 title = section
-                if config.getAppendHostname():
-                    try:
-                        hostname = subprocess.check_output(['hostname', '-s'], text=True).strip()
-                    except:
-                        hostname = socket.gethostname().split('.')[0]
+                if append_hostname:
                     title = '%s (%s)' % (section, hostname)
                     logger.info('Appending hostname to share: %s -> %s' % (section, title))
                 
                 count = 1
                 while title in old_titles:
                     count += 1
-                    if config.getAppendHostname():
+                    if append_hostname:
                         title = '%s (%s) [%d]' % (section, hostname, count)
                     else:
                         title = '%s [%d]' % (section, count)
@@ -85,14 +181,18 @@ class ZCBroadcast:
         """ Look for TiVos using Zeroconf. """
         VIDS = '_tivo-videos._tcp.local.'
         names = []
+        found = threading.Event()
 
         self.logger.info('Scanning for TiVos...')
 
         # Get the names of servers offering TiVo videos
-        browser = zeroconf.ServiceBrowser(self.rz, VIDS, ZCListener(names))
+        browser = zeroconf.ServiceBrowser(self.rz, VIDS,
+                                          ZCListener(names, found))
 
-        # Give them a second to respond
-        time.sleep(1)
+        # Give them up to a second to respond, then a moment for any
+        # stragglers once the first answer is in
+        if found.wait(1):
+            time.sleep(0.2)
 
         # Any results?
         if names:
@@ -101,75 +201,178 @@ class ZCBroadcast:
         else:
             self.logger.info('No TiVos found on network')
 
-        # Now get the addresses -- this is the slow part
-        for name in names:
-            info = self.rz.getServiceInfo(VIDS, name + '.' + VIDS)
-            if info:
-                self.logger.debug('Got service info for: %s' % name)
-                # Python 3: properties might be bytes, need to handle both
-                # Try both 'TSN' and 'tsn' keys, and handle bytes
-                tsn = info.properties.get(b'TSN') or info.properties.get('TSN')
-                if config.get_server('togo_all'):
-                    tsn = info.properties.get(b'tsn') or info.properties.get('tsn', tsn)
-                # Decode bytes to string if needed
-                if isinstance(tsn, bytes):
-                    tsn = tsn.decode('utf-8')
-                if tsn:
-                    address = socket.inet_ntoa(info.getAddress())
-                    port = info.getPort()
-                    config.tivos[tsn] = {'name': name, 'address': address, 
-                                         'port': port}
-                    # Convert property values from bytes to strings for Python 3
-                    for key, value in info.properties.items():
-                        prop_key = key.decode('utf-8') if isinstance(key, bytes) else key
-                        prop_value = value.decode('utf-8') if isinstance(value, bytes) else value
-                        config.tivos[tsn][prop_key] = prop_value
-                    self.logger.info('%s - TSN: %s, Address: %s:%d' % (name, tsn, address, port))
+        # Now get the addresses -- this is the slow part, so overlap the
+        # lookups instead of waiting on each one in turn
+        timeout = config.get_zc_timeout()
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            lookups = [executor.submit(self.get_tivo_info, VIDS, name,
+                                       timeout)
+                       for name in list(names)]
+            for future in as_completed(lookups):
+                name, tsn, props = future.result()
+                if props is None:
+                    self.logger.debug('No service info for: %s' % name)
+                elif tsn:
+                    config.tivos[tsn] = props
+                    self.logger.info('%s - TSN: %s, Address: %s:%d' %
+                                     (name, tsn, props['address'],
+                                      props['port']))
                     # Log additional TiVo properties
-                    platform = config.tivos[tsn].get('platform', 'unknown')
-                    sw_version = config.tivos[tsn].get('swversion', 'unknown')
+                    platform = props.get('platform', 'unknown')
+                    sw_version = props.get('swversion', 'unknown')
                     self.logger.debug('  Platform: %s, Software: %s' % (platform, sw_version))
                 else:
                     self.logger.debug('No TSN found for: %s' % name)
-            else:
-                self.logger.debug('No service info for: %s' % name)
 
         return names
 
+    def get_tivo_info(self, type, name, timeout=3000):
+        """ Look up one TiVo's address and properties, waiting up to
+            timeout ms. Returns the name, the TSN (or None), and a dict
+            of properties (None if the lookup failed).
+
+        """
+        info = self.rz.getServiceInfo(type, name + '.' + type, timeout)
+        if not info:
+            return name, None, None
+
+        self.logger.debug('Got service info for: %s' % name)
+        # Python 3: properties might be bytes, need to handle both
+        # Try both 'TSN' and 'tsn' keys, and handle bytes
+        tsn = info.properties.get(b'TSN') or info.properties.get('TSN')
+        if config.get_server('togo_all'):
+            tsn = info.properties.get(b'tsn') or info.properties.get('tsn', tsn)
+        # Decode bytes to string if needed
+        if isinstance(tsn, bytes):
+            tsn = tsn.decode('utf-8')
+        if not tsn:
+            return name, None, {}
+
+        props = {'name': name, 'address': socket.inet_ntoa(info.getAddress()),
+                 'port': info.getPort()}
+        # Convert property keys and values from bytes to strings for Python 3
+        props.update({
+            (k.decode('utf-8', 'replace') if isinstance(k, bytes) else k):
+            (v.decode('utf-8', 'replace') if isinstance(v, bytes) else v)
+            for k, v in info.properties.items()})
+        return name, tsn, props
+
     def shutdown(self):
         self.logger.info('Unregistering: %s' % ' '.join(self.share_names))
         for info in self.share_info:
             self.rz.unregisterService(info)
         self.rz.close()
 
+class DirectConnection:
+    """ One client of the direct-connect beacon server: read its
+        length-prefixed beacon, then answer with ours. The socket is
+        non-blocking, so each call does only as much as is ready.
+
+    """
+    def __init__(self, sock, beacon):
+        self.sock = sock
+        self.beacon = beacon
+        self.inbuf = bytearray()
+        self.length = None
+        self.outbuf = None
+
+    def on_read(self):
+        """ Returns True when the connection is finished with. """
+        try:
+            data = self.sock.recv(4096)
+        except BlockingIOError:
+            # Spurious wakeup; stay registered and wait for real data
+            return False
+        if not data:
+            return True
+        self.inbuf += data
+        if self.length is None and len(self.inbuf) >= 4:
+            self.length = int.from_bytes(self.inbuf[:4], 'big')
+            del self.inbuf[:4]
+        if self.length is not None and len(self.inbuf) >= self.length:
+            packet = self.beacon.format_beacon('connected')
+            self.outbuf = memoryview(len(packet).to_bytes(4, 'big') + packet)
+        return False
+
+    def on_write(self):
+        """ Returns True once our whole beacon has been sent. """
+        try:
+            sent = self.sock.send(self.outbuf)
+        except BlockingIOError:
+            return False
+        self.outbuf = self.outbuf[sent:]
+        return not self.outbuf
+
 class Beacon:
-    def __init__(self):
+    def __init__(self, shares=None):
+        if shares is None:
+            shares = config.getShares()
         self.UDPSock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.UDPSock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         self.services = []
+        self.beacon_socks = {}
 
         self.platform = PLATFORM_VIDEO
-        for section, settings in config.getShares():
+        for section, settings in shares:
             try:
-                ct = GetPlugin(settings['type']).CONTENT_TYPE
+                ct = get_content_type(settings['type'])
             except:
                 continue
             if ct in ('x-container/tivo-music', 'x-container/tivo-photos'):
                 self.platform = PLATFORM_MAIN
                 break
 
+        self.services_line = b'services=\n'
+        self.refresh_targets()
+
         if config.get_zc():
             logger = logging.getLogger('pyTivo.beacon')
             try:
-                self.bd = ZCBroadcast(logger)
+                self.bd = ZCBroadcast(logger, shares)
             except Exception as e:
                 logger.error('Zeroconf failure: %s' % str(e))
                 self.bd = None
         else:
             self.bd = None
 
+    def refresh_targets(self):
+        """ Re-read the broadcast addresses and our identity from the
+            config.
+
+        """
+        # Everything after the method line only changes on a config
+        # reload, except the services, so build it here, not per beacon
+        self.beacon_static = ('identity={%s}\nmachine=%s\nplatform=%s\n' %
+                              (config.getGUID(), socket.gethostname(),
+                               self.platform)).encode('utf-8')
+        self.beacon_ips = tuple(ip for ip in config.getBeaconAddresses().split()
+                                if ip != 'listen')
+        old_socks, self.beacon_socks = self.beacon_socks, {}
+        for sock in old_socks.values():
+            sock.close()
+
+    def target_sock(self, beacon_ip):
+        """ A UDP socket connected to one beacon address. The kernel
+            keeps the route (and we keep the resolved name) for it, so
+            later sends skip the per-packet lookups.
+
+        """
+        sock = self.beacon_socks.get(beacon_ip)
+        if not sock:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+            try:
+                sock.connect((beacon_ip, 2190))
+            except:
+                sock.close()
+                raise
+            self.beacon_socks[beacon_ip] = sock
+        return sock
+
     def add_service(self, service):
         self.services.append(service)
+        self.services_line = ('services=%s\n' %
+                              self.format_services()).encode('utf-8')
         logger = logging.getLogger('pyTivo.beacon')
         beacon_addrs = config.getBeaconAddresses()
         logger.info('Beacon addresses: %s' % beacon_addrs)
@@ -180,93 +383,146 @@ class Beacon:
         return ';'.join(self.services)
 
     def format_beacon(self, conntype, services=True):
-        beacon = ['tivoconnect=1',
-                  'method=%s' % conntype,
-                  'identity={%s}' % config.getGUID(),
-                  'machine=%s' % socket.gethostname(),
-                  'platform=%s' % self.platform]
-
+        """ The beacon as bytes, ready to send. """
         if services:
-            beacon.append('services=' + self.format_services())
+            services_line = self.services_line
         else:
-            beacon.append('services=TiVoMediaServer:0/http')
+            services_line = b'services=TiVoMediaServer:0/http\n'
 
-        return '\n'.join(beacon) + '\n'
+        return (b'tivoconnect=1\nmethod=%s\n' % conntype.encode('utf-8') +
+                self.beacon_static + services_line)
 
     def send_beacon(self):
-        beacon_ips = config.getBeaconAddresses()
         beacon = self.format_beacon('broadcast')
         logger = logging.getLogger('pyTivo.beacon')
-        for beacon_ip in beacon_ips.split():
-            if beacon_ip != 'listen':
-                try:
-                    packet = beacon
-                    bytes_sent = 0
-                    while packet:
-                        result = self.UDPSock.sendto(packet.encode('utf-8'), (beacon_ip, 2190))
-                        if result < 0:
-                            break
-                        bytes_sent += result
-                        packet = packet[result:]
-                    logger.debug('Beacon broadcast: %d bytes to %s:2190' % (bytes_sent, beacon_ip))
-                except Exception as e:
-                    logger.error('Beacon broadcast failed to %s: %s' % (beacon_ip, str(e)))
+
+        # Batch as many as possible into one syscall; anything left over
+        # (or everything, if sendmmsg() isn't available) goes one by one
+        sent = 0
+        if _libc_sendmmsg:
+            try:
+                sent = _sendmmsg(self.UDPSock, beacon, self.beacon_ips, 2190)
+            except OSError as e:
+                logger.debug('Beacon sendmmsg failed: %s' % str(e))
+            for beacon_ip in self.beacon_ips[:sent]:
+                logger.debug('Beacon broadcast: %d bytes to %s:2190' % (len(beacon), beacon_ip))
+
+        for beacon_ip in self.beacon_ips[sent:]:
+            try:
+                # UDP datagrams go out whole or not at all
+                bytes_sent = self.target_sock(beacon_ip).send(beacon)
+                logger.debug('Beacon broadcast: %d bytes to %s:2190' % (bytes_sent, beacon_ip))
+            except Exception as e:
+                logger.error('Beacon broadcast failed to %s: %s' % (beacon_ip, str(e)))
 
     def start(self):
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        """ Broadcast now, then once a minute until stopped. """
         self.send_beacon()
-        self.timer = Timer(60, self.start)
-        self.timer.start()
+        while not self.stopped.wait(60):
+            self.send_beacon()
 
     def stop(self):
-        self.timer.cancel()
+        self.stopped.set()
+        for sock in self.beacon_socks.values():
+            sock.close()
         if self.bd:
             self.bd.shutdown()
 
     def recv_bytes(self, sock, length):
-        block = b''
-        while len(block) < length:
-            add = sock.recv(length - len(block))
+        block = bytearray(length)
+        view = memoryview(block)
+        got = 0
+        while got < length:
+            add = sock.recv_into(view[got:])
             if not add:
-                break
-            block += add
-        return block
+                return bytes(block[:got])
+            got += add
+        return bytes(block)
 
     def recv_packet(self, sock):
-        length = struct.unpack('!I', self.recv_bytes(sock, 4))[0]
+        length = int.from_bytes(self.recv_bytes(sock, 4), 'big')
         return self.recv_bytes(sock, length)
 
     def send_packet(self, sock, packet):
         if isinstance(packet, str):
             packet = packet.encode('utf-8')
-        sock.sendall(struct.pack('!I', len(packet)) + packet)
+        sock.sendall(len(packet).to_bytes(4, 'big') + packet)
 
     def listen(self):
         """ For the direct-connect, TCP-style beacon """
-        import _thread as thread
 
         def server():
             TCPSock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Allow an immediate rebind on restart
+            TCPSock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             TCPSock.bind(('', 2190))
-            TCPSock.listen(5)
-
-            while True:
-                # Wait for a connection
-                client, address = TCPSock.accept()
-
-                # Accept (and discard) the client's beacon
-                self.recv_packet(client)
+            TCPSock.listen(128)
+            TCPSock.setblocking(False)
 
-                # Send ours
-                self.send_packet(client, self.format_beacon('connected'))
+            sel = selectors.DefaultSelector()
+            sel.register(TCPSock, selectors.EVENT_READ)
 
-                client.close()
-
-        thread.start_new_thread(server, ())
+            while True:
+                for key, mask in sel.select():
+                    if key.fileobj is TCPSock:
+                        # New connections -- take everything that's
+                        # queued, not just one per wakeup
+                        while True:
+                            try:
+                                client, address = TCPSock.accept()
+                            except BlockingIOError:
+                                break
+                            except ConnectionAbortedError:
+                                # Gone before we got to it; try the next
+                                continue
+                            except OSError as e:
+                                # Out of descriptors or buffers: the
+                                # connection stays queued and the socket
+                                # stays readable, so back off rather than
+                                # spin on it
+                                logging.getLogger('pyTivo.beacon').error(
+                                    'Beacon accept failed: %s' % str(e))
+                                time.sleep(1)
+                                break
+                            client.setblocking(False)
+                            # Don't let Nagle hold back our small reply
+                            client.setsockopt(socket.IPPROTO_TCP,
+                                              socket.TCP_NODELAY, 1)
+                            sel.register(client, selectors.EVENT_READ,
+                                         DirectConnection(client, self))
+                        continue
+
+                    conn = key.data
+                    try:
+                        if mask & selectors.EVENT_READ:
+                            # Accept (and discard) the client's beacon
+                            done = conn.on_read()
+                            if not done and conn.outbuf is not None:
+                                # Send ours right away; the send buffer is
+                                # almost always free, so we only go back
+                                # to the selector if it wasn't
+                                done = conn.on_write()
+                                if not done:
+                                    sel.modify(conn.sock,
+                                               selectors.EVENT_WRITE, conn)
+                        else:
+                            done = conn.on_write()
+                    except OSError:
+                        done = True
+                    if done:
+                        sel.unregister(conn.sock)
+                        conn.sock.close()
+
+        threading.Thread(target=server, daemon=True).start()
 
     def get_name(self, address):
         """ Exchange beacons, and extract the machine name. """
         our_beacon = self.format_beacon('connected', False)
-        machine_name = re.compile('machine=(.*)\n').search
 
         try:
             tsock = socket.socket()
@@ -274,9 +530,7 @@ class Beacon:
             self.send_packet(tsock, our_beacon)
             tivo_beacon = self.recv_packet(tsock)
             tsock.close()
-            if isinstance(tivo_beacon, bytes):
-                tivo_beacon = tivo_beacon.decode('utf-8')
-            name = machine_name(tivo_beacon).groups()[0]
+            name = MACHINE_NAME(tivo_beacon).group(1).decode('utf-8')
         except:
             name = address
 
@@ -8,10 +8,13 @@ This script tests for various TiVo interfaces:
 3. Web interface (ports 80, 443)
 """
 
+import errno
+import selectors
 import socket
 import sys
 import struct
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional
 
 # Common TiVo ports
@@ -24,12 +27,26 @@ def check_port(host: str, port: int, timeout: float = 3.0) -> bool:
     """Check if a port is open on the host."""
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
+    except socket.error:
+        return False
+    try:
+        # Non-blocking connect, then wait for it to become writable, so
+        # the timeout is enforced here rather than by the OS
+        sock.setblocking(False)
         result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
+        if result == 0:
+            return True
+        if result not in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+            return False
+        with selectors.DefaultSelector() as sel:
+            sel.register(sock, selectors.EVENT_WRITE)
+            if not sel.select(timeout):
+                return False
+        return sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
     except socket.error:
         return False
+    finally:
+        sock.close()
 
 def test_network_remote(host: str, timeout: float = 3.0) -> Tuple[bool, Optional[str]]:
     """
@@ -119,10 +136,25 @@ def check_tivo_interfaces(host: str):
     print(f"Checking TiVo interfaces for: {host}")
     print("=" * 60)
     
+    # Probe every port at once, so the wait is the slowest port's
+    # rather than the sum of them all
+    ports = (REMOTE_CONTROL_PORT, MIND_RPC_PORT, HTTP_PORT, HTTPS_PORT)
+    with ThreadPoolExecutor(max_workers=len(ports)) as ex:
+        futures = {port: ex.submit(check_port, host, port) for port in ports}
+        open_ports = {port: f.result() for port, f in futures.items()}
+        
+        # Then talk to whichever protocol ports answered, also in parallel
+        tests = {}
+        if open_ports[REMOTE_CONTROL_PORT]:
+            tests[REMOTE_CONTROL_PORT] = ex.submit(test_network_remote, host)
+        if open_ports[MIND_RPC_PORT]:
+            tests[MIND_RPC_PORT] = ex.submit(test_mind_rpc, host)
+        results = {port: f.result() for port, f in tests.items()}
+    
     # Check Network Remote Control
     print(f"\n[Network Remote Control - Port {REMOTE_CONTROL_PORT}]")
-    if check_port(host, REMOTE_CONTROL_PORT):
-        available, info = test_network_remote(host)
+    if open_ports[REMOTE_CONTROL_PORT]:
+        available, info = results[REMOTE_CONTROL_PORT]
         if available:
             print(f"✓ AVAILABLE")
             print(f"  Info: {info}")
@@ -137,8 +169,8 @@ def check_tivo_interfaces(host: str):
     
     # Check Mind RPC
     print(f"\n[Mind RPC Interface - Port {MIND_RPC_PORT}]")
-    if check_port(host, MIND_RPC_PORT):
-        available, info = test_mind_rpc(host)
+    if open_ports[MIND_RPC_PORT]:
+        available, info = results[MIND_RPC_PORT]
         if available:
             print(f"✓ AVAILABLE (undocumented)")
             print(f"  Info: {info}")
@@ -153,7 +185,7 @@ def check_tivo_interfaces(host: str):
     
     # Check HTTP
     print(f"\n[Web Interface - Port {HTTP_PORT}]")
-    if check_port(host, HTTP_PORT):
+    if open_ports[HTTP_PORT]:
         print(f"✓ AVAILABLE")
         print(f"  URL: http://{host}")
     else:
@@ -161,7 +193,7 @@ def check_tivo_interfaces(host: str):
     
     # Check HTTPS
     print(f"\n[Web Interface (HTTPS) - Port {HTTPS_PORT}]")
-    if check_port(host, HTTPS_PORT):
+    if open_ports[HTTPS_PORT]:
         print(f"✓ AVAILABLE")
         print(f"  URL: https://{host}")
     else:
@@ -71,6 +71,7 @@ class TivoHTTPServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
         self.containers.clear()
         for section, settings in config.getShares():
             self.add_container(section, settings)
+        self.beacon.refresh_targets()
 
     def handle_error(self, request, client_address):
         self.logger.exception('Exception during request from %s' % 
@@ -109,6 +109,12 @@ find "$INSTALL_DIR" -type f -name "*.pyc" -delete 2>/dev/null || true
 find "$INSTALL_DIR" -type f -name "*.pyo" -delete 2>/dev/null || true
 print_success "Cleanup complete"
 
+# Precompile so the first start doesn't pay for it. Some bundled library
+# modules are Python 2 only and never imported; ignore their errors.
+print_status "Compiling bytecode..."
+python3 -m compileall -q "$INSTALL_DIR" > /dev/null 2>&1 || true
+print_success "Bytecode compiled"
+
 # Set executable permissions
 print_status "Setting executable permissions..."
 chmod +x "$INSTALL_DIR/pyTivo.py"
@@ -1,12 +1,10 @@
 #!/usr/bin/env python3
 
-# Python 3: Disable bytecode generation to avoid caching issues
-import sys
-sys.dont_write_bytecode = True
-
 import logging
 import os
 import platform
+import sys
+import threading
 import time
 
 try:
@@ -23,17 +21,22 @@ def exceptionLogger(*args):
     sys.excepthook = sys.__excepthook__
     logging.getLogger('pyTivo').error('Exception in pyTivo', exc_info=args)
 
+def _py_mtimes(path):
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _py_mtimes(entry.path)
+                elif entry.name.endswith('.py'):
+                    yield entry.stat().st_mtime
+    except OSError:
+        pass
+
 def last_date():
-    lasttime = -1
     path = os.path.dirname(__file__)
     if not path:
         path = '.'
-    for root, dirs, files in os.walk(path):
-        for name in files:
-            if name.endswith('.py'):
-                tm = os.path.getmtime(os.path.join(root, name))
-                if tm > lasttime:
-                    lasttime = tm
+    lasttime = max(_py_mtimes(path), default=-1)
 
     return time.asctime(time.localtime(lasttime))
 
@@ -48,11 +51,12 @@ def setup(in_service=False):
         httpserver.TivoHTTPHandler)
 
     logger = logging.getLogger('pyTivo')
-    logger.info('Last modified: ' + last_date())
     logger.info('Python: ' + platform.python_version())
     logger.info('System: ' + platform.platform())
 
-    for section, settings in config.getShares():
+    # One snapshot of the shares feeds the server and the beacon
+    shares = config.getShares()
+    for section, settings in shares:
         # Validate path for shares that have one
         if 'path' in settings:
             share_path = settings['path']
@@ -62,7 +66,7 @@ def setup(in_service=False):
                 logger.error('Share [%s]: path not found: %s' % (section, share_path))
         httpd.add_container(section, settings)
 
-    b = beacon.Beacon()
+    b = beacon.Beacon(shares)
     b.add_service('TiVoMediaServer:%s/http' % port)
     b.start()
     if 'listen' in config.getBeaconAddresses():
@@ -72,6 +76,12 @@ def setup(in_service=False):
     httpd.set_service_status(in_service)
 
     logger.info('pyTivo is ready.')
+
+    # Walking the source tree for this can be slow (e.g. on a network
+    # mount), so keep it off the startup path
+    threading.Thread(target=lambda: logger.info('Last modified: ' +
+                                                last_date()),
+                     daemon=True).start()
     return httpd
 
 def serve(httpd):
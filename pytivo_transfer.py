@@ -15,17 +15,385 @@ import argparse
 import subprocess
 import re
 import os
+import ctypes
+import ctypes.util
+import select
+import configparser
+import selectors
 import smtplib
 import urllib.parse
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from functools import partial
 from tivo_remote import TiVoRemote, TiVoButton, TiVoNavigator
 
 
+# pyTivo log lines of interest
+_START_RE = re.compile(r'Start sending "([^"]+)"')
+_DONE_RE = re.compile(r'Done sending "([^"]+)"')
+# Whole log lines carrying a transfer marker; the lazy prefix makes the
+# captured marker the first one on the line
+_MARKER_LINE_RE = re.compile(rb'^[^\n]*?(Start sending|Done sending|Mb/s|bytes)[^\n]*', re.MULTILINE)
+# Start/Done sending events with the quoted path and, for completions,
+# the elapsed seconds pyTivo appends to the line
+_TRANSFER_EVENT_RE = re.compile(rb'(Start|Done) sending "([^"\n]+)"(?:[^\n]*\((\d+)s\))?')
+_CONTAINER_RE = re.compile(r'Container=([^&\s]+)')
+_FOUND_FILES_RE = re.compile(r'Found (\d+) files')
+
+# Files wait_for_stable_files watches in a share
+_VIDEO_EXTS = frozenset({'.mkv', '.mp4', '.avi', '.mpg', '.mpeg', '.ts'})
+
+# pyTivo config and process list
+_PS_CONFIG_RE = re.compile(rb'-c\s+(\S+\.conf)')
+
+# Navigation config lines, matched across the whole file at once. The
+# alternatives are tried in order, so comments win over everything and
+# anything else with two or more words is a button and delay.
+_NAV_LINE_RE = re.compile(r'''
+    ^[ \t]*(?:
+        \#.* |
+        \[(?P<section>.*)\][ \t]*$ |
+        (?P<wait_for>WAIT_FOR)(?:[ \t]+"(?P<wait_text>[^"\n]+)")?.* |
+        (?P<locate_share>LOCATE_SHARE)(?:[ \t]+"(?P<share_text>[^"\n]+)")?.* |
+        (?P<keyword>TRANSFER_ALL|DELETE_SOURCE_FILE)[ \t]*$ |
+        (?P<button>\S+)[ \t]+(?P<delay>\S+).*
+    )''', re.MULTILINE | re.IGNORECASE | re.VERBOSE)
+
+# inotify lets LogTailer sleep until pyTivo actually writes to its log
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_inotify_init1 = None
+_inotify_add_watch = None
+if sys.platform.startswith('linux'):
+    try:
+        _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                            use_errno=True)
+        _inotify_init1 = _libc.inotify_init1
+        _inotify_init1.argtypes = [ctypes.c_int]
+        _inotify_init1.restype = ctypes.c_int
+        _inotify_add_watch = _libc.inotify_add_watch
+        _inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        _inotify_add_watch.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _inotify_init1 = None
+        _inotify_add_watch = None
+
+
+class LogTailer:
+    """
+    Follow a growing log file through one persistent file descriptor.
+    
+    New data is read with os.pread() at an offset kept here, sized from
+    one fstat(), and any trailing partial line is carried over to the
+    next read. On Linux,
+    wait() blocks on an inotify IN_MODIFY watch, and on macOS/BSD on a
+    kqueue NOTE_WRITE/NOTE_EXTEND event, so it returns as soon as the log
+    is written. Elsewhere it polls, starting at MIN_POLL after the log
+    last grew and backing off towards MAX_POLL while it is idle.
+    
+    If the log is rotated (renamed or deleted and recreated), the new
+    file at path is opened and followed from its start.
+    """
+    
+    MIN_POLL = 0.1
+    MAX_POLL = 5.0
+    
+    def __init__(self, path: str):
+        """
+        Open the log and position at its current end.
+        
+        Args:
+            path: Log file to follow
+        """
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        st = os.fstat(self.fd)
+        self.ino = (st.st_dev, st.st_ino)
+        self.orphaned = False
+        self.pos = st.st_size
+        self.carry = b''
+        self.poll_interval = self.MIN_POLL
+        self.inotify_fd = None
+        self.selector = None
+        self.kqueue = None
+        self._watch()
+    
+    def _watch(self):
+        """Set up the inotify/kqueue watch on the open log, if available."""
+        if _inotify_init1:
+            fd = _inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                mask = _IN_MODIFY | _IN_ATTRIB | _IN_DELETE_SELF | _IN_MOVE_SELF
+                if _inotify_add_watch(fd, os.fsencode(self.path), mask) >= 0:
+                    self.inotify_fd = fd
+                    self.selector = selectors.DefaultSelector()
+                    self.selector.register(fd, selectors.EVENT_READ)
+                else:
+                    os.close(fd)
+        elif hasattr(select, 'kqueue'):
+            self.kqueue = select.kqueue()
+            self.kqueue.control([select.kevent(
+                self.fd, filter=select.KQ_FILTER_VNODE,
+                flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+                fflags=(select.KQ_NOTE_WRITE | select.KQ_NOTE_EXTEND |
+                        select.KQ_NOTE_RENAME | select.KQ_NOTE_DELETE))], 0, 0)
+    
+    def _unwatch(self):
+        """Tear down the inotify/kqueue watch, leaving the log open."""
+        if self.kqueue:
+            self.kqueue.close()
+            self.kqueue = None
+        if self.selector:
+            self.selector.close()
+            self.selector = None
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+    
+    def _reopen(self):
+        """
+        Switch to the file now at path and follow it from its start.
+        
+        The new file is opened before anything is released, so if it
+        cannot be opened yet the old descriptor and position are kept.
+        
+        Returns:
+            True if the new file was opened, False otherwise
+        """
+        try:
+            fd = os.open(self.path, os.O_RDONLY)
+        except OSError:
+            # Try again on the next idle read; no watch fires for it
+            self.orphaned = True
+            return False
+        st = os.fstat(fd)
+        
+        self._unwatch()
+        os.close(self.fd)
+        self.fd = fd
+        self.ino = (st.st_dev, st.st_ino)
+        self.orphaned = False
+        self.pos = 0
+        self.carry = b''
+        self._watch()
+        return True
+    
+    def _rotated(self):
+        """Check whether path now names a different file than the one open."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            # Rotated away but not recreated yet; keep the old file, and
+            # poll in wait() since no watch will fire for the new one
+            self.orphaned = True
+            return False
+        return (st.st_dev, st.st_ino) != self.ino
+    
+    def tell(self):
+        """Return the offset of the next line read_chunk() will return."""
+        return self.pos - len(self.carry)
+    
+    def seek(self, pos: int):
+        """Continue reading from offset pos, as returned by tell()."""
+        self.pos = pos
+        self.carry = b''
+    
+    def seek_end(self):
+        """Skip everything written so far, discarding any partial line."""
+        self.pos = os.fstat(self.fd).st_size
+        self.carry = b''
+    
+    def read_chunk(self):
+        """
+        Read whatever has been appended since the last call as one block.
+        
+        Callers can search the block with bytes.find() and only slice out
+        and decode the lines that match, rather than creating an object
+        for every line.
+        
+        Returns:
+            Bytes holding the new complete lines, ending with the last
+            newline (b'' if no line was completed)
+        """
+        # One fstat tells whether there is anything to read at all
+        size = os.fstat(self.fd).st_size
+        if size == self.pos:
+            # Only an idle log can have been rotated, so only stat it then
+            if self._rotated() and self._reopen():
+                return self.read_chunk()
+            self.poll_interval = min(self.poll_interval * 1.5, self.MAX_POLL)
+            return b''
+        if size < self.pos:
+            # Log was truncated underneath us; start over
+            self.pos = 0
+            self.carry = b''
+        
+        # Ask for exactly what fstat reported; loop only on a short read
+        chunks = [self.carry]
+        while self.pos < size:
+            chunk = os.pread(self.fd, size - self.pos, self.pos)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            self.pos += len(chunk)
+        
+        self.poll_interval = self.MIN_POLL
+        data = b''.join(chunks)
+        end = data.rfind(b'\n') + 1
+        self.carry = data[end:]
+        return data[:end]
+    
+    def wait(self, timeout: float):
+        """
+        Block until the log is modified or timeout seconds pass.
+        
+        Without inotify or kqueue this returns after the current poll
+        interval, so callers should just read again and loop until their
+        own deadline, as follow() does.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        if self.orphaned:
+            time.sleep(min(timeout, self.poll_interval))
+            return
+        
+        if self.kqueue:
+            # EV_CLEAR resets the event once it has been returned
+            self.kqueue.control(None, 1, max(timeout, 0))
+            return
+        
+        if not self.selector:
+            time.sleep(min(timeout, self.poll_interval))
+            return
+        
+        if self.selector.select(timeout):
+            # Drain queued events; we only care that something changed
+            try:
+                while os.read(self.inotify_fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+    
+    def follow(self, timeout: float):
+        """
+        Yield each block of new lines until timeout seconds have passed.
+        
+        This is the read/wait/deadline loop shared by every log monitor;
+        callers just scan the blocks and break or return once satisfied.
+        A block is empty when a wait ended without a complete new line.
+        
+        Args:
+            timeout: How long to follow the log, in seconds
+        
+        Yields:
+            Bytes blocks as returned by read_chunk()
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                chunk = self.read_chunk()
+            except OSError as e:
+                print(f"Error reading log: {e}")
+                chunk = b''
+                time.sleep(1)
+            yield chunk
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            self.wait(remaining)
+    
+    def close(self):
+        """Release the log and inotify/kqueue descriptors."""
+        self._unwatch()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def _quoted_after(line: str, prefix: str):
+    """
+    Return the text between prefix and the next double quote in line.
+    
+    A cheaper equivalent of searching for prefix + '"([^"]+)"' for log
+    lines such as: Start sending "/path/file.mkv" to ...
+    
+    Args:
+        line: Log line to scan
+        prefix: Literal text ending with the opening quote
+    
+    Returns:
+        The quoted text, or None if prefix is absent or the quote is empty
+        or unterminated
+    """
+    _, found, rest = line.partition(prefix)
+    if found:
+        text, closed, _ = rest.partition('"')
+        if closed and text:
+            return text
+    return None
+
+
+def _parse_pytivo_conf(text: str):
+    """
+    Parse pyTivo.conf text into {section: {key: value}}.
+    
+    The text is read with the same parser pyTivo's config.py uses,
+    configparser.ConfigParser with its default settings, so 'key: value',
+    indented keys, continuation lines and %(name)s interpolation come out
+    as pyTivo sees them. The result is flattened to plain dicts, with any
+    DEFAULT values merged into every section.
+    
+    Args:
+        text: Contents of the config file
+    
+    Returns:
+        Dict mapping section names to dicts of their options
+    """
+    parser = configparser.ConfigParser()
+    parser.read_string(text)
+    return {section: dict(parser[section]) for section in parser.sections()}
+
+
+def read_log_tail(path: str, count: int):
+    """
+    Return the last count lines of a log without reading the whole file.
+    
+    Reads a 16 KiB window from the end, which normally holds a hundred
+    pyTivo lines, and widens it up to 256 KiB only if it fell short.
+    
+    Args:
+        path: Log file to read
+        count: Number of lines wanted
+    
+    Returns:
+        List of up to count lines (str, without line endings), oldest first
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        for window in (16384, 65536, 262144):
+            start = max(0, size - window)
+            f.seek(start)
+            lines = f.read().splitlines()
+            if start:
+                lines = lines[1:]  # First line is probably cut off
+            if len(lines) >= count or not start:
+                break
+    return [line.decode('utf-8', 'replace') for line in lines[-count:]]
+
+
 class PyTivoAutomation:
     """Automate pyTivo transfers."""
     
+    # Found by _find_nav_config / _find_pytivo_config and shared by all
+    # instances; '' records that pyTivo.conf was searched for and not found
+    _nav_config_path = None
+    _pytivo_conf_path = None
+    
     def __init__(self, tivo_host: str, nav_config: str = None):
         """
         Initialize automation.
@@ -38,19 +406,47 @@ class PyTivoAutomation:
         self.remote = TiVoRemote(tivo_host)
         self.nav = TiVoNavigator(self.remote)
         self.transfer_list = []  # Track files with status: [{filename, status}, ...]
+        self.transfer_index = {}  # filename -> transfer_list entry
         self.tivo_host = tivo_host
         self.transfer_start_time = None
         self.transfer_end_time = None
-        
-        # Find navigation config file
+        self.log_tailer = None  # Shared LogTailer, opened on first use
+        self._share_file_count = None  # Set by LOCATE_SHARE for TRANSFER_ALL
+        self._cached_config_path = None  # Cleared by the 'reload' command
+        self._cached_log_path = None
+        self._pytivo_configs = {}  # path -> (mtime, {section: {key: value}})
+        self._share_paths = None  # (config, {section: path}), see _get_share_paths
+        self._nav_config_key = None  # (path, mtime, size) of the loaded nav config
+        
+        # Find navigation config file; a searched-for one is searched for
+        # again on 'reload', in case it has been created or moved since
+        self._nav_config_searched = nav_config is None
         if nav_config is None:
             nav_config = self._find_nav_config()
         
         self.nav_config = nav_config
         self.nav_sequences = self.load_navigation_config()
     
-    def _find_nav_config(self):
-        """Find tivo_navigation.txt in standard locations."""
+    @classmethod
+    def _find_nav_config(cls, refresh: bool = False):
+        """
+        Find tivo_navigation.txt in standard locations.
+        
+        PYTIVO_NAV_CONFIG overrides the search. The result, including the
+        current-directory default when nothing is found, is cached on the
+        class, so later calls and instances do not repeat the lookup.
+        
+        Args:
+            refresh: Search again instead of using the cached result
+        """
+        if cls._nav_config_path and not refresh:
+            return cls._nav_config_path
+        
+        env_path = os.environ.get('PYTIVO_NAV_CONFIG')
+        if env_path and os.path.exists(env_path):
+            cls._nav_config_path = env_path
+            return env_path
+        
         search_paths = [
             'tivo_navigation.txt',  # Current directory
             os.path.join(os.path.dirname(__file__), 'tivo_navigation.txt'),  # Same dir as script
@@ -61,13 +457,30 @@ class PyTivoAutomation:
         
         for path in search_paths:
             if os.path.exists(path):
+                cls._nav_config_path = path
                 return path
         
         # Default to current directory if not found
-        return 'tivo_navigation.txt'
+        cls._nav_config_path = 'tivo_navigation.txt'
+        return cls._nav_config_path
     
-    def _find_pytivo_config(self):
-        """Find pyTivo.conf in standard locations."""
+    @classmethod
+    def _find_pytivo_config(cls, refresh: bool = False):
+        """
+        Find pyTivo.conf in standard locations.
+        
+        The result, found or not, is cached on the class like
+        _find_nav_config's.
+        
+        Args:
+            refresh: Search again instead of using the cached result
+        
+        Returns:
+            Path to pyTivo.conf, or None if there is none
+        """
+        if cls._pytivo_conf_path is not None and not refresh:
+            return cls._pytivo_conf_path or None
+        
         search_paths = [
             '/usr/local/etc/pytivo.conf',  # Primary system install (lowercase)
             '/usr/local/etc/pyTivo.conf',  # Primary system install (capitalized)
@@ -81,8 +494,10 @@ class PyTivoAutomation:
         
         for path in search_paths:
             if os.path.exists(path):
+                cls._pytivo_conf_path = path
                 return path
         
+        cls._pytivo_conf_path = ''
         return None
     
     def get_pytivo_shares(self):
@@ -98,18 +513,16 @@ class PyTivoAutomation:
         
         shares = []
         try:
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(config_path)
+            config = self._get_pytivo_config(config_path)
             
-            for section in config.sections():
+            for section in config:
                 # Skip special sections
                 if section.lower() in ['server', 'togo'] or section.startswith('_tivo'):
                     continue
                 
                 # Check if it's a video share
-                if config.has_option(section, 'type'):
-                    share_type = config.get(section, 'type').lower()
+                if 'type' in config[section]:
+                    share_type = config[section]['type'].lower()
                     if share_type == 'video':
                         shares.append(section)
         except Exception as e:
@@ -135,20 +548,18 @@ class PyTivoAutomation:
         search_path = os.path.abspath(os.path.expanduser(path)).rstrip('/')
         
         try:
-            import configparser
-            config = configparser.ConfigParser()
-            config.read(config_path)
+            config = self._get_pytivo_config(config_path)
             
-            for section in config.sections():
+            for section in config:
                 # Skip special sections
                 if section.lower() in ['server', 'togo'] or section.startswith('_tivo'):
                     continue
                 
                 # Check if it's a video share with matching path
-                if config.has_option(section, 'type') and config.has_option(section, 'path'):
-                    share_type = config.get(section, 'type').lower()
+                if 'type' in config[section] and 'path' in config[section]:
+                    share_type = config[section]['type'].lower()
                     if share_type == 'video':
-                        share_path = os.path.abspath(os.path.expanduser(config.get(section, 'path'))).rstrip('/')
+                        share_path = os.path.abspath(os.path.expanduser(config[section]['path'])).rstrip('/')
                         if share_path == search_path:
                             return section
         except Exception as e:
@@ -160,76 +571,95 @@ class PyTivoAutomation:
         """
         Load navigation sequences from config file.
         
+        Each step is compiled to a (callable, param) pair so that
+        execute_sequence only has to call step(param). Button names are
+        resolved to TiVoButton members here, so unknown buttons are
+        reported once at load time rather than on every run. If the file
+        is unchanged since the last load, the current sequences are
+        returned as they are.
+        
         Returns:
-            Dict mapping command names to list of (button, delay) tuples
+            Dict mapping command names to list of (callable, param) tuples
         """
         sequences = {}
         
-        if not os.path.exists(self.nav_config):
+        # TOP, BOTTOM and TIVO are navigator actions, not single presses
+        nav_actions = {
+            'TOP': self.nav.jump_to_top,
+            'BOTTOM': self.nav.jump_to_bottom,
+            'TIVO': self.nav.go_home,
+        }
+        
+        try:
+            st = os.stat(self.nav_config)
+        except OSError:
             print(f"Warning: Navigation config not found: {self.nav_config}")
+            # Whatever appears there next must be parsed, not matched
+            self._nav_config_key = None
             return sequences
         
+        # Nothing to do if the file is unchanged since it was last parsed
+        key = (self.nav_config, st.st_mtime_ns, st.st_size)
+        if key == self._nav_config_key:
+            return self.nav_sequences
+        
         try:
             with open(self.nav_config, 'r') as f:
-                current_command = None
-                current_sequence = []
+                text = f.read()
+            
+            # Steps before the first [name] header are discarded
+            current_sequence = []
+            
+            # One pass over the whole file; comments, blank lines and
+            # single-word lines produce no match or are skipped here
+            for match in _NAV_LINE_RE.finditer(text):
+                section, wait_for, locate_share, keyword, button_name = match.group(
+                    'section', 'wait_for', 'locate_share', 'keyword', 'button')
+                line = match.group().strip()
                 
-                for line in f:
-                    line = line.strip()
-                    
-                    # Skip comments and empty lines
-                    if not line or line.startswith('#'):
+                if section is not None:
+                    # A repeated name replaces the earlier definition
+                    current_sequence = sequences[section.lower()] = []
+                elif wait_for is not None:
+                    # Parse: WAIT_FOR "text to match"
+                    if match.group('wait_text'):
+                        current_sequence.append((self._step_wait_for, match.group('wait_text')))
+                    else:
+                        print(f"Warning: Invalid WAIT_FOR syntax in line: {line}")
+                elif locate_share is not None:
+                    # Parse: LOCATE_SHARE "share name" (supports ${VAR} or $VAR expansion)
+                    if match.group('share_text'):
+                        current_sequence.append((self._step_locate_share, os.path.expandvars(match.group('share_text'))))
+                    else:
+                        print(f"Warning: Invalid LOCATE_SHARE syntax in line: {line}")
+                elif keyword is not None:
+                    if keyword.upper() == 'TRANSFER_ALL':
+                        current_sequence.append((self._step_transfer_all, False))
+                    elif current_sequence and current_sequence[-1][0] == self._step_transfer_all:
+                        # DELETE_SOURCE_FILE right after TRANSFER_ALL is handled
+                        # by that step, on the files it completed
+                        current_sequence[-1] = (self._step_transfer_all, True)
+                    else:
+                        current_sequence.append((self._step_delete_source_file, None))
+                elif button_name is not None:
+                    try:
+                        delay = float(match.group('delay'))
+                    except ValueError:
+                        print(f"Warning: Invalid delay in line: {line}")
                         continue
-                    
-                    # Check for command name [name]
-                    if line.startswith('[') and line.endswith(']'):
-                        # Save previous command if exists
-                        if current_command and current_sequence:
-                            sequences[current_command] = current_sequence
-                        
-                        # Start new command
-                        current_command = line[1:-1].lower()
-                        current_sequence = []
+                    button_name = button_name.upper()
+                    if button_name in nav_actions:
+                        current_sequence.append((self._step_nav, nav_actions[button_name]))
                         continue
-                    
-                    # Parse button and delay, or special commands
-                    if line.upper().startswith('WAIT_FOR'):
-                        # Parse: WAIT_FOR "text to match"
-                        match = re.search(r'WAIT_FOR\s+"([^"]+)"', line, re.IGNORECASE)
-                        if match:
-                            wait_text = match.group(1)
-                            current_sequence.append(('WAIT_FOR', wait_text))
-                        else:
-                            print(f"Warning: Invalid WAIT_FOR syntax in line: {line}")
-                    elif line.upper().startswith('LOCATE_SHARE'):
-                        # Parse: LOCATE_SHARE "share name" (supports ${VAR} or $VAR expansion)
-                        match = re.search(r'LOCATE_SHARE\s+"([^"]+)"', line, re.IGNORECASE)
-                        if match:
-                            share_text = match.group(1)
-                            # Expand environment variables in share name
-                            # Supports both ${VAR} and $VAR syntax
-                            import string
-                            share_text = os.path.expandvars(share_text)
-                            current_sequence.append(('LOCATE_SHARE', share_text))
-                        else:
-                            print(f"Warning: Invalid LOCATE_SHARE syntax in line: {line}")
-                    elif line.upper().strip() == 'TRANSFER_ALL':
-                        current_sequence.append(('TRANSFER_ALL', None))
-                    elif line.upper().strip() == 'DELETE_SOURCE_FILE':
-                        current_sequence.append(('DELETE_SOURCE_FILE', None))
+                    button = TiVoButton.__members__.get(button_name)
+                    if button is None:
+                        print(f"Warning: Unknown button '{button_name}' in line: {line}")
                     else:
-                        parts = line.split()
-                        if len(parts) >= 2:
-                            button_name = parts[0].upper()
-                            try:
-                                delay = float(parts[1])
-                                current_sequence.append((button_name, delay))
-                            except ValueError:
-                                print(f"Warning: Invalid delay in line: {line}")
-                
-                # Save last command
-                if current_command and current_sequence:
-                    sequences[current_command] = current_sequence
+                        current_sequence.append((partial(self.remote.press, button), delay))
+            
+            # Commands without any steps are not usable
+            sequences = {name: steps for name, steps in sequences.items() if steps}
+            self._nav_config_key = key
             
             # Don't print during initialization - only in interactive/verbose mode
             # print(f"Loaded {len(sequences)} navigation sequences from {self.nav_config}")
@@ -237,8 +667,36 @@ class PyTivoAutomation:
             
         except Exception as e:
             print(f"Error loading navigation config: {e}")
+            self._nav_config_key = None
             return {}
     
+    def get_log_tailer(self, log_path: str):
+        """
+        Get the shared LogTailer for the pyTivo log, opening it on first use.
+        
+        Reusing one tailer means consecutive WAIT_FOR steps continue from
+        where the previous one stopped reading instead of reopening the log.
+        
+        Opening the log doubles as the existence check, so callers do not
+        need to stat it first.
+        
+        Args:
+            log_path: Path to the pyTivo log file
+        
+        Returns:
+            LogTailer positioned after the last line consumed, or None if
+            there is no log path or the log cannot be opened
+        """
+        if self.log_tailer and self.log_tailer.path != log_path:
+            self.log_tailer.close()
+            self.log_tailer = None
+        if not self.log_tailer and log_path:
+            try:
+                self.log_tailer = LogTailer(log_path)
+            except OSError:
+                return None
+        return self.log_tailer
+    
     def wait_for_log_message(self, search_text: str, timeout_minutes: int = 5):
         """
         Wait for a specific message to appear in the log file.
@@ -250,37 +708,20 @@ class PyTivoAutomation:
         Returns:
             True if message found, False if timeout
         """
-        log_path = self.get_log_file_path()
-        if not log_path or not os.path.exists(log_path):
+        tailer = self.get_log_tailer(self.get_log_file_path())
+        if not tailer:
             print(f"Warning: Cannot monitor log file")
             return False
         
         print(f"Waiting for log message: '{search_text}'")
         
-        # Get current position in log file
-        with open(log_path, 'r') as f:
-            f.seek(0, 2)  # Seek to end
-            start_pos = f.tell()
-        
-        start_time = time.time()
+        search_bytes = search_text.encode('utf-8')
         
-        while (time.time() - start_time) < (timeout_minutes * 60):
-            try:
-                with open(log_path, 'r') as f:
-                    f.seek(start_pos)
-                    new_lines = f.readlines()
-                    start_pos = f.tell()
-                
-                for line in new_lines:
-                    if search_text in line:
-                        print(f"✓ Found: {search_text}")
-                        return True
-                
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"Error reading log: {e}")
-                time.sleep(1)
+        for chunk in tailer.follow(timeout_minutes * 60):
+            # Lines never span the search text, so test the block at once
+            if search_bytes in chunk:
+                print(f"✓ Found: {search_text}")
+                return True
         
         print(f"✗ Timeout waiting for: {search_text}")
         return False
@@ -295,20 +736,27 @@ class PyTivoAutomation:
         
         while (time.time() - start_time) < timeout:
             try:
-                # Get all video files (including symlinks)
-                all_entries = os.listdir(share_path)
+                # Get all video files (including symlinks) and their first
+                # sizes in one pass; scandir entries know their own type
                 files = []
                 symlinks = []
-                for f in all_entries:
-                    full_path = os.path.join(share_path, f)
-                    # Check if it's a video file extension
-                    if f.lower().endswith(('.mkv', '.mp4', '.avi', '.mpg', '.mpeg', '.ts')):
-                        # Check symlink first (before isfile, as isfile may return False for broken symlinks)
-                        if os.path.islink(full_path):
-                            symlinks.append(f)
-                            files.append(f)
-                        elif os.path.isfile(full_path):
+                sizes1 = {}
+                with os.scandir(share_path) as entries:
+                    for entry in entries:
+                        f = entry.name
+                        # Check if it's a video file extension
+                        if os.path.splitext(f)[1].lower() in _VIDEO_EXTS:
+                            # Check symlink first (before is_file, as it is False for broken symlinks)
+                            if entry.is_symlink():
+                                symlinks.append(f)
+                            elif not entry.is_file():
+                                continue
                             files.append(f)
+                            try:
+                                # stat() follows symlinks, so this is the target's size
+                                sizes1[f] = entry.stat().st_size
+                            except OSError:
+                                pass
                 
                 if symlinks:
                     print(f"  Found {len(symlinks)} symlink(s): {', '.join(symlinks)}")
@@ -316,16 +764,6 @@ class PyTivoAutomation:
                 if not files:
                     return True
                 
-                # For symlinks, check the target file size; for regular files, check directly
-                sizes1 = {}
-                for f in files:
-                    try:
-                        full_path = os.path.join(share_path, f)
-                        # os.path.getsize follows symlinks automatically
-                        sizes1[f] = os.path.getsize(full_path)
-                    except:
-                        pass
-                
                 time.sleep(2)
                 
                 sizes2 = {}
@@ -368,26 +806,17 @@ class PyTivoAutomation:
             Tuple of (found: bool, file_count: int or None)
         """
         # Wait for files to be stable before navigating
-        config_path = self.get_pytivo_config_path()
-        if config_path:
+        if self.get_pytivo_config_path():
             try:
-                with open(config_path, 'r') as f:
-                    in_section = False
-                    for line in f:
-                        stripped = line.strip()
-                        if stripped.startswith('['):
-                            section = stripped[1:-1]
-                            in_section = share_name.lower() in section.lower()
-                        elif in_section and stripped.lower().startswith('path'):
-                            match = re.search(r'path\s*=\s*(.+)', stripped, re.IGNORECASE)
-                            if match:
-                                self.wait_for_stable_files(match.group(1).strip())
-                                break
+                for section, share_path in self._get_share_paths().items():
+                    if share_name.lower() in section.lower():
+                        self.wait_for_stable_files(share_path)
+                        break
             except:
                 pass
         
-        log_path = self.get_log_file_path()
-        if not log_path or not os.path.exists(log_path):
+        tailer = self.get_log_tailer(self.get_log_file_path())
+        if not tailer:
             print(f"Warning: Cannot monitor log file for share location")
             return (False, None)
         
@@ -396,12 +825,11 @@ class PyTivoAutomation:
         # Track previous share to detect when we've reached the end of the list
         # (DOWN on last item re-selects the same item)
         previous_share = None
+        share_name_encoded = share_name.replace(' ', '%20')
         
         for attempt in range(max_attempts):
-            # Get current log position
-            with open(log_path, 'r') as f:
-                f.seek(0, 2)
-                start_pos = f.tell()
+            # Only lines logged after this attempt's presses matter
+            tailer.seek_end()
             
             # Navigate: DOWN then SELECT
             print(f"  Attempt {attempt + 1}: DOWN")
@@ -414,19 +842,18 @@ class PyTivoAutomation:
             found = False
             file_count = None
             current_share = None
-            timeout = time.time() + 3  # 3 second timeout per attempt
             
-            while time.time() < timeout:
+            # 3 second timeout per attempt
+            for chunk in tailer.follow(3):
+                # Only decode blocks holding a line we could act on
+                if b'Container=' not in chunk and b'Found' not in chunk:
+                    continue
                 try:
-                    with open(log_path, 'r') as f:
-                        f.seek(start_pos)
-                        new_lines = f.readlines()
-                    
-                    for line in new_lines:
+                    for line in chunk.decode('utf-8', 'replace').splitlines():
                         # Look for: Container=Share%20Name or Container="Share Name"
                         if 'QueryContainer' in line and 'Container=' in line:
                             # Debug: Extract and display the actual container name from the log
-                            container_match = re.search(r'Container=([^&\s]+)', line)
+                            container_match = _CONTAINER_RE.search(line)
                             if container_match:
                                 container_encoded = container_match.group(1)
                                 container_decoded = urllib.parse.unquote(container_encoded)
@@ -442,24 +869,17 @@ class PyTivoAutomation:
                                     return (False, None)
                             
                             # Extract container name from URL-encoded or regular format
-                            if share_name in line or share_name.replace(' ', '%20') in line:
+                            if share_name in line or share_name_encoded in line:
                                 found = True
                                 print(f"    ✓ Match! Looking for file count...")
                         
                         # Look for: Found X files, total=Y
                         if found and 'Found' in line and 'files' in line:
-                            match = re.search(r'Found (\d+) files', line)
+                            match = _FOUND_FILES_RE.search(line)
                             if match:
                                 file_count = int(match.group(1))
                                 print(f"✓ Found share: {share_name} ({file_count} files)")
                                 return (True, file_count)
-                    
-                    if found and file_count is None:
-                        # Found container but no file count yet, keep waiting
-                        time.sleep(0.2)
-                        continue
-                    
-                    time.sleep(0.2)
                 except Exception as e:
                     print(f"Error reading log: {e}")
                     break
@@ -487,8 +907,8 @@ class PyTivoAutomation:
         Returns:
             Number of items transferred
         """
-        log_path = self.get_log_file_path()
-        if not log_path or not os.path.exists(log_path):
+        tailer = self.get_log_tailer(self.get_log_file_path())
+        if not tailer:
             print(f"Warning: Cannot monitor log file for transfers")
             return 0
         
@@ -501,77 +921,75 @@ class PyTivoAutomation:
             print(f"Transferring all items in list (max {max_items})...")
         
         # Wait for all files in share to be stable before starting
-        config_path = self.get_pytivo_config_path()
-        if config_path:
+        if self.get_pytivo_config_path():
             try:
-                with open(config_path, 'r') as f:
-                    lines = f.readlines()
-                
-                # Find all share sections and check their paths
-                for i, line in enumerate(lines):
-                    stripped = line.strip()
-                    if stripped.startswith('[') and stripped.endswith(']'):
-                        section = stripped[1:-1]
-                        if section not in ['_tivo_SD', '_tivo_HD', 'Server']:
-                            # Look for path in this section
-                            for j in range(i+1, len(lines)):
-                                check_line = lines[j].strip()
-                                if check_line.startswith('['):
-                                    break
-                                if check_line.lower().startswith('path'):
-                                    match = re.search(r'path\s*=\s*(.+)', check_line, re.IGNORECASE)
-                                    if match:
-                                        share_path = match.group(1).strip()
-                                        self.wait_for_stable_files(share_path, timeout=120)
-                                    break
+                for share_path in self._get_share_paths().values():
+                    self.wait_for_stable_files(share_path, timeout=120)
             except Exception as e:
                 print(f"Note: Could not check file stability: {e}")
         
         transferred = 0
         self.transfer_list = []  # Reset transfer list
+        self.transfer_index = {}
         
         # Get initial log position BEFORE any SELECT presses
-        with open(log_path, 'r') as f:
-            f.seek(0, 2)
-            initial_log_pos = f.tell()
+        tailer.seek_end()
+        initial_log_pos = tailer.tell()
+        
+        # Log state gathered since queueing began; each line is read once
+        last_file = None  # Most recent File= requested by the TiVo
+        started = []  # Basenames from 'Start sending', in log order
+        reported = 0  # How many of those have been printed
+        
+        def read_new_log_lines():
+            nonlocal last_file
+            for line in tailer.read_chunk().splitlines():
+                # Only the two kinds of line tracked here are decoded
+                if b'File=' not in line and b'Start sending' not in line:
+                    continue
+                line = line.decode('utf-8', 'replace')
+                
+                # Look for GET request with File= parameter
+                if 'GET' in line:
+                    _, found, rest = line.partition('File=')
+                    if found:
+                        # Value runs up to the next '&' or whitespace
+                        encoded = rest.split('&', 1)[0].split(None, 1)
+                        if encoded:
+                            decoded = urllib.parse.unquote(encoded[0])
+                            last_file = decoded.lstrip('/').split('/')[-1]
+                full_path = _quoted_after(line, 'Start sending "')
+                if full_path:
+                    started.append(os.path.basename(full_path))
+        
+        def report_started(indent):
+            nonlocal reported
+            for started_filename in started[reported:]:
+                print(f"{indent}→ Transfer started: {started_filename}")
+            reported = len(started)
+            sys.stdout.flush()
         
         for item_num in range(items_to_transfer):
             print(f"  Item {item_num + 1}: ", end="")
             sys.stdout.flush()
             
-            # Get current log position before this item
-            with open(log_path, 'r') as f:
-                f.seek(0, 2)
-                item_log_pos = f.tell()
-            
             # Press SELECT to enter item details
             self.remote.press(TiVoButton.SELECT, delay=2.5)
             
-            # Get filename from log - look for GET request with File= parameter
+            # Get filename from log - the latest GET request with File= parameter.
+            # If this item logged none, that is the previous item's file again,
+            # which the duplicate check below treats as the end of the list.
+            # The SELECT delay has already given pyTivo time to log it.
             filename = None
-            import urllib.parse
             try:
-                time.sleep(0.5)  # Let log entry appear
-                with open(log_path, 'r') as f:
-                    f.seek(initial_log_pos)
-                    new_lines = f.readlines()
-                
-                # Look backwards from most recent for File= parameter in GET request
-                for line in reversed(new_lines):
-                    if 'GET' in line and 'File=' in line:
-                        match = re.search(r'File=([^&\s]+)', line)
-                        if match:
-                            encoded = match.group(1)
-                            decoded = urllib.parse.unquote(encoded)
-                            filename = decoded.lstrip('/').split('/')[-1]
-                            break
+                read_new_log_lines()
+                filename = last_file
             except Exception as e:
                 pass
             
             if filename:
                 # Check for duplicate
-                is_duplicate = any(item['filename'] == filename for item in self.transfer_list)
-                if is_duplicate:
+                if filename in self.transfer_index:
                     print(f"{filename} (DUPLICATE - skipping)")
                     sys.stdout.flush()
                     # Skip this item - press LEFT twice to back out and move to next
@@ -580,7 +998,9 @@ class PyTivoAutomation:
                     continue
                 else:
                     print(f"{filename}")
-                    self.transfer_list.append({'filename': filename, 'status': 'queued'})
+                    item = {'filename': filename, 'status': 'queued'}
+                    self.transfer_list.append(item)
+                    self.transfer_index[filename] = item
             else:
                 print("(filename not detected)")
                 self.transfer_list.append({'filename': f'Item {item_num + 1}', 'status': 'queued'})
@@ -591,15 +1011,8 @@ class PyTivoAutomation:
             
             # Check for Start sending before SELECT
             try:
-                with open(log_path, 'r') as f:
-                    f.seek(item_log_pos)
-                    check_lines = f.readlines()
-                for line in check_lines:
-                    if 'Start sending' in line:
-                        match = re.search(r'Start sending "([^"]+)"', line)
-                        if match:
-                            print(f"    → Transfer started: {os.path.basename(match.group(1))}")
-                            sys.stdout.flush()
+                read_new_log_lines()
+                report_started("    ")
             except:
                 pass
             
@@ -616,15 +1029,8 @@ class PyTivoAutomation:
             
             # Check for Start sending after LEFT
             try:
-                with open(log_path, 'r') as f:
-                    f.seek(item_log_pos)
-                    check_lines = f.readlines()
-                for line in check_lines:
-                    if 'Start sending' in line:
-                        match = re.search(r'Start sending "([^"]+)"', line)
-                        if match:
-                            print(f"    → Transfer started: {os.path.basename(match.group(1))}")
-                            sys.stdout.flush()
+                read_new_log_lines()
+                report_started("    ")
             except:
                 pass
             
@@ -633,23 +1039,13 @@ class PyTivoAutomation:
         
         # Check log for any transfers that started during queueing
         try:
-            with open(log_path, 'r') as f:
-                f.seek(initial_log_pos)
-                all_lines = f.readlines()
-            
-            for line in all_lines:
-                if 'Start sending' in line:
-                    match = re.search(r'Start sending "([^"]+)"', line)
-                    if match:
-                        full_path = match.group(1)
-                        started_filename = os.path.basename(full_path)
-                        print(f"  → Transfer started: {started_filename}")
-                        sys.stdout.flush()
-                        # Update status in transfer_list
-                        for item in self.transfer_list:
-                            if started_filename in item['filename'] and item['status'] == 'queued':
-                                item['status'] = 'in-progress'
-                                break
+            read_new_log_lines()
+            report_started("  ")
+            for started_filename in started:
+                # Update status in transfer_list
+                item = self._find_transfer(started_filename, ('in-progress', 'completed'))
+                if item:
+                    item['status'] = 'in-progress'
         except:
             pass
         
@@ -668,6 +1064,28 @@ class PyTivoAutomation:
         # Return count and initial log position so monitoring can check for completions during queueing
         return (transferred, initial_log_pos)
     
+    def _find_transfer(self, filename: str, skip_statuses):
+        """
+        Find the transfer_list entry a logged filename refers to.
+        
+        Exact names are looked up in transfer_index. Only names that were
+        never queued as-is fall back to the substring scan.
+        
+        Args:
+            filename: Basename from a Start/Done sending log line
+            skip_statuses: Statuses that make an entry ineligible
+        
+        Returns:
+            The matching entry, or None
+        """
+        item = self.transfer_index.get(filename)
+        if item is not None:
+            return item if item['status'] not in skip_statuses else None
+        for item in self.transfer_list:
+            if item['status'] not in skip_statuses and filename in item['filename']:
+                return item
+        return None
+    
     def monitor_all_transfers(self, expected_count: int, queueing_start_pos: int = None, timeout_minutes: int = 120):
         """
         Monitor log for all transfers to complete.
@@ -687,7 +1105,8 @@ class PyTivoAutomation:
             print(f"Make sure pyTivo is running and check config")
             return []
         
-        if not os.path.exists(log_path):
+        tailer = self.get_log_tailer(log_path)
+        if not tailer:
             print(f"ERROR: Log file does not exist: {log_path}")
             print(f"Make sure pyTivo is running")
             return []
@@ -696,89 +1115,39 @@ class PyTivoAutomation:
         print(f"Watching pyTivo log: {log_path}\n")
         sys.stdout.flush()
         
-        # Check for completions that happened during queueing
         completed_count = 0
         if queueing_start_pos is not None:
-            try:
-                with open(log_path, 'r') as f:
-                    f.seek(queueing_start_pos)
-                    historical_lines = f.readlines()
-                
-                # Scan for Done sending messages that occurred during queueing
-                for line in historical_lines:
-                    if 'Done sending' in line:
-                        match = re.search(r'Done sending "([^"]+)"', line)
-                        if match:
-                            full_path = match.group(1)
-                            completed_filename = os.path.basename(full_path)
-                            
-                            # Find and update in transfer_list
-                            for item in self.transfer_list:
-                                if item['status'] != 'completed' and completed_filename in item['filename']:
-                                    item['status'] = 'completed'
-                                    completed_count += 1
-                                    
-                                    # Extract elapsed time if present
-                                    elapsed_match = re.search(r'\((\d+)s\)', line)
-                                    elapsed = elapsed_match.group(1) if elapsed_match else "?"
-                                    print(f"  [{completed_count}/{expected_count}] ✓ Completed: {item['filename']} (elapsed: {elapsed}s)")
-                                    sys.stdout.flush()
-                                    break
-            except Exception as e:
-                print(f"Warning: Error checking for early completions: {e}")
-        
-        # Get current log position to continue monitoring from NOW
-        with open(log_path, 'r') as f:
-            f.seek(0, 2)
-            start_pos = f.tell()
+            # Rewind so completions logged during queueing are counted too
+            tailer.seek(queueing_start_pos)
+        else:
+            tailer.seek_end()
         
         start_time = time.time()
         
         # Monitor for Start sending and Done sending messages and update transfer_list
-        while (time.time() - start_time) < (timeout_minutes * 60):
+        for chunk in tailer.follow(timeout_minutes * 60):
             try:
-                with open(log_path, 'r') as f:
-                    f.seek(start_pos)
-                    new_lines = f.readlines()
-                    start_pos = f.tell()
-                
-                for line in new_lines:
-                    line = line.strip()
+                # One regex pass over the new block finds every Start/Done
+                # event, so no other log line is ever looked at in Python
+                for match in _TRANSFER_EVENT_RE.finditer(chunk):
+                    kind, full_path, elapsed = match.groups()
+                    filename = os.path.basename(full_path.decode('utf-8', 'replace'))
                     
-                    # Track Start sending
-                    if 'Start sending' in line:
-                        match = re.search(r'Start sending "([^"]+)"', line)
-                        if match:
-                            full_path = match.group(1)
-                            started_filename = os.path.basename(full_path)
-                            
-                            # Find in transfer_list and update status
-                            for item in self.transfer_list:
-                                if item['status'] not in ['in-progress', 'completed'] and started_filename in item['filename']:
-                                    item['status'] = 'in-progress'
-                                    print(f"  → Transfer started: {item['filename']}")
-                                    sys.stdout.flush()
-                                    break
-                    
-                    # Track Done sending
-                    if 'Done sending' in line:
-                        match = re.search(r'Done sending "([^"]+)"', line)
-                        if match:
-                            full_path = match.group(1)
-                            completed_filename = os.path.basename(full_path)
+                    if kind == b'Start':
+                        # Find in transfer_list and update status
+                        item = self._find_transfer(filename, ('in-progress', 'completed'))
+                        if item:
+                            item['status'] = 'in-progress'
+                            print(f"  → Transfer started: {item['filename']}")
+                    else:
+                        # Find and update in transfer_list
+                        item = self._find_transfer(filename, ('completed',))
+                        if item:
+                            item['status'] = 'completed'
+                            completed_count += 1
                             
-                            # Find and update in transfer_list
-                            for item in self.transfer_list:
-                                if item['status'] != 'completed' and completed_filename in item['filename']:
-                                    item['status'] = 'completed'
-                                    completed_count += 1
-                                    
-                                    # Extract elapsed time if present
-                                    elapsed_match = re.search(r'\((\d+)s\)', line)
-                                    elapsed = elapsed_match.group(1) if elapsed_match else "?"
-                                    print(f"  [{completed_count}/{expected_count}] ✓ Completed: {item['filename']} (elapsed: {elapsed}s)")
-                                    sys.stdout.flush()
-                                    break
+                            elapsed = elapsed.decode() if elapsed else "?"
+                            print(f"  [{completed_count}/{expected_count}] ✓ Completed: {item['filename']} (elapsed: {elapsed}s)")
                 
                 # Check if all expected transfers are complete
                 if completed_count >= expected_count:
@@ -790,7 +1159,8 @@ class PyTivoAutomation:
                     sys.stdout.flush()
                     return [item['filename'] for item in self.transfer_list if item['status'] == 'completed']
                 
-                time.sleep(1)
+                # One flush per poll covers every event printed above
+                sys.stdout.flush()
                 
             except Exception as e:
                 print(f"Error reading log: {e}")
@@ -818,112 +1188,113 @@ class PyTivoAutomation:
         sequence = self.nav_sequences[command_name]
         print(f"Executing sequence: {command_name}")
         
-        # Track file count from LOCATE_SHARE for use with TRANSFER_ALL
-        file_count = None
-        transferred_count = 0
-        should_delete = False
-        
-        for idx, (button_name, param) in enumerate(sequence):
-            # Handle special commands
-            if button_name == 'WAIT_FOR':
-                # param is the text to wait for
-                if not self.wait_for_log_message(param):
-                    print(f"Warning: Continuing despite timeout")
-            elif button_name == 'LOCATE_SHARE':
-                # param is the share name to find
-                found, file_count = self.locate_share(param)
-                if not found:
-                    print(f"Warning: Could not locate share '{param}'")
-            elif button_name == 'TRANSFER_ALL':
-                # Transfer all items in current list, using file_count if available
-                self.transfer_start_time = time.time()
-                
-                result = self.transfer_all_items(expected_count=file_count)
-                
-                # Unpack result
-                if isinstance(result, tuple):
-                    transferred_count, queueing_start_pos = result
-                else:
-                    transferred_count = result
-                    queueing_start_pos = None
+        # Only log lines written from here on belong to this sequence
+        if self.log_tailer:
+            self.log_tailer.seek_end()
+        
+        # Presses with no delay are coalesced until the next write; steps
+        # that watch the log flush them first
+        self._share_file_count = None
+        with self.remote.pipeline():
+            for step, param in sequence:
+                step(param)
+        
+        return True
+    
+    def _step_nav(self, action):
+        """Run a TOP, BOTTOM or TIVO navigator action."""
+        action()
+    
+    def _step_wait_for(self, text: str):
+        """Run a WAIT_FOR step: wait for text to appear in the pyTivo log."""
+        self.remote.flush()
+        if not self.wait_for_log_message(text):
+            print(f"Warning: Continuing despite timeout")
+    
+    def _step_locate_share(self, share_name: str):
+        """Run a LOCATE_SHARE step, keeping its file count for TRANSFER_ALL."""
+        self.remote.flush()
+        found, self._share_file_count = self.locate_share(share_name)
+        if not found:
+            print(f"Warning: Could not locate share '{share_name}'")
+    
+    def _step_transfer_all(self, delete_after: bool):
+        """
+        Run a TRANSFER_ALL step and monitor the queued transfers.
+        
+        Args:
+            delete_after: True if DELETE_SOURCE_FILE followed TRANSFER_ALL
+        """
+        self.remote.flush()
+        # Transfer all items in current list, using file_count if available
+        self.transfer_start_time = time.time()
+        
+        result = self.transfer_all_items(expected_count=self._share_file_count)
+        
+        # Unpack result
+        if isinstance(result, tuple):
+            transferred_count, queueing_start_pos = result
+        else:
+            transferred_count = result
+            queueing_start_pos = None
+        
+        # Monitor all transfers if we have a count
+        if transferred_count > 0:
+            try:
+                completed_files = self.monitor_all_transfers(transferred_count, queueing_start_pos)
+                self.transfer_end_time = time.time()
                 
-                # Check if next command is DELETE_SOURCE_FILE
-                if idx + 1 < len(sequence) and sequence[idx + 1][0] == 'DELETE_SOURCE_FILE':
-                    should_delete = True
+                # Send success email
+                self.send_email_notification(success=True)
+            except Exception as e:
+                self.transfer_end_time = time.time()
                 
-                # Monitor all transfers if we have a count
-                if transferred_count > 0:
-                    try:
-                        completed_files = self.monitor_all_transfers(transferred_count, queueing_start_pos)
-                        self.transfer_end_time = time.time()
-                        
-                        # Send success email
-                        self.send_email_notification(success=True)
-                    except Exception as e:
-                        self.transfer_end_time = time.time()
-                        
-                        # Send failure email
-                        self.send_email_notification(success=False, error_message=str(e))
-                        raise
-                else:
-                    pass
-                    
-                    # Delete files if DELETE_SOURCE_FILE follows TRANSFER_ALL
-                    if should_delete and completed_files:
-                        print(f"\n{'=' * 60}")
-                        print(f"DELETING TRANSFERRED FILES")
-                        print(f"{'=' * 60}")
-                        for filename in completed_files:
-                            print(f"  Deleting: {filename}")
+                # Send failure email
+                self.send_email_notification(success=False, error_message=str(e))
+                raise
+        else:
+            pass
+            
+            # Delete files if DELETE_SOURCE_FILE follows TRANSFER_ALL
+            if delete_after and completed_files:
+                print(f"\n{'=' * 60}")
+                print(f"DELETING TRANSFERRED FILES")
+                print(f"{'=' * 60}")
+                for filename in completed_files:
+                    print(f"  Deleting: {filename}")
+                    self.remove_file(filename)
+                print(f"{'=' * 60}\n")
+    
+    def _step_delete_source_file(self, _):
+        """Run a DELETE_SOURCE_FILE step: delete the last file pyTivo finished sending."""
+        self.remote.flush()
+        # Extract filename from last "Done sending" log message and delete it
+        log_path = self.get_log_file_path()
+        if log_path:
+            try:
+                for line in reversed(read_log_tail(log_path, 100)):
+                    if 'Done sending' in line:
+                        match = _DONE_RE.search(line)
+                        if match:
+                            filename = match.group(1)
+                            print(f"Deleting transferred file: {filename}")
                             self.remove_file(filename)
-                        print(f"{'=' * 60}\n")
-            elif button_name == 'DELETE_SOURCE_FILE':
-                # Skip if already handled after TRANSFER_ALL
-                if not should_delete:
-                    # Extract filename from last "Done sending" log message and delete it
-                    log_path = self.get_log_file_path()
-                    if log_path and os.path.exists(log_path):
-                        try:
-                            with open(log_path, 'r') as f:
-                                lines = f.readlines()
-                                for line in reversed(lines[-100:]):
-                                    if 'Done sending' in line:
-                                        match = re.search(r'Done sending "([^"]+)"', line)
-                                        if match:
-                                            filename = match.group(1)
-                                            print(f"Deleting transferred file: {filename}")
-                                            self.remove_file(filename)
-                                            break
-                        except Exception as e:
-                            print(f"Error deleting source file: {e}")
-                    else:
-                        print("Warning: Cannot delete file - log not accessible")
-                # Reset flag
-                should_delete = False
-            elif button_name == 'TOP':
-                self.nav.jump_to_top()
-            elif button_name == 'BOTTOM':
-                self.nav.jump_to_bottom()
-            elif button_name == 'TIVO':
-                self.nav.go_home()
-            else:
-                # param is the delay
-                # Get button from enum
-                try:
-                    button = TiVoButton[button_name]
-                    self.remote.press(button, delay=param)
-                except KeyError:
-                    print(f"Warning: Unknown button '{button_name}'")
-        
-        return True
+                            break
+            except Exception as e:
+                print(f"Error deleting source file: {e}")
+        else:
+            print("Warning: Cannot delete file - log not accessible")
     
     def connect(self) -> bool:
         """Connect to TiVo."""
         return self.remote.connect()
     
     def disconnect(self):
-        """Disconnect from TiVo."""
+        """Disconnect from TiVo and stop following the pyTivo log."""
         self.remote.disconnect()
+        if self.log_tailer:
+            self.log_tailer.close()
+            self.log_tailer = None
     
     def find_share_by_name(self, max_attempts: int = 30) -> bool:
         """
@@ -945,14 +1316,12 @@ class PyTivoAutomation:
         # In My Shows, external shares are typically at the bottom
         # Navigate down to bottom
         print("Navigating to bottom of My Shows...")
-        for i in range(max_attempts):
-            self.remote.press(TiVoButton.DOWN, delay=0.15)
+        self.remote.press_n(TiVoButton.DOWN, max_attempts, delay=0.15)
         
         # Now navigate up a few to get to the shares
         # (bottom item might be settings or something)
         print("Moving up to shares...")
-        for _ in range(5):
-            self.remote.press(TiVoButton.UP, delay=0.3)
+        self.remote.press_n(TiVoButton.UP, 5, delay=0.3)
         
         print("Should be positioned near pyTivo shares")
         return True
@@ -1004,8 +1373,7 @@ class PyTivoAutomation:
         print(f"Navigating to video at position {position}...")
         
         # Navigate to the video
-        for i in range(position):
-            self.remote.press(TiVoButton.DOWN, delay=0.3)
+        self.remote.press_n(TiVoButton.DOWN, position, delay=0.3)
         
         # Select to start transfer
         print("Starting transfer...")
@@ -1080,6 +1448,8 @@ class PyTivoAutomation:
         # Fall back to hardcoded sequence
         self.nav.go_home()
         self.remote.press(TiVoButton.SELECT, delay=0.5)
+        # LEFT and RIGHT switch panels, so give each time to animate;
+        # jump_to_bottom sends its DOWN run with press_n and settles after
         self.remote.press(TiVoButton.LEFT, delay=0.5)
         self.nav.jump_to_bottom()
         self.remote.press(TiVoButton.RIGHT, delay=0.5)
@@ -1098,27 +1468,65 @@ class PyTivoAutomation:
         
         # Fall back to hardcoded sequence
         self.go_to_devices()
-        self.remote.press(TiVoButton.SELECT, delay=0.5)
-        self.remote.press(TiVoButton.SELECT, delay=0.5)
+        self.remote.press_sequence([TiVoButton.SELECT, TiVoButton.SELECT], delay=0.5)
         print("At Import from pyTivo screen")
     
     def get_pytivo_config_path(self):
-        """Find pyTivo config file from running process."""
+        """Find pyTivo config file from running process (cached once found)."""
+        if self._cached_config_path:
+            return self._cached_config_path
         try:
-            # Get pytivo process with config file path
-            result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-            for line in result.stdout.split('\n'):
-                if 'pytivo' in line.lower() and '.conf' in line.lower():
-                    # Look for -c flag followed by config path
-                    match = re.search(r'-c\s+(\S+\.conf)', line)
-                    if match:
-                        return match.group(1)
+            # Read argv straight from /proc where available; ps is the fallback
+            try:
+                config_path = self._find_config_in_proc()
+            except OSError:
+                # No /proc (macOS, BSD) or it cannot be listed
+                config_path = self._find_config_in_ps()
+            if config_path:
+                self._cached_config_path = config_path
+                return config_path
         except Exception as e:
             print(f"Error finding config: {e}")
         return None
     
+    def _find_config_in_proc(self):
+        """Scan /proc/<pid>/cmdline for a pytivo process started with -c <file>.conf."""
+        for pid in os.listdir('/proc'):
+            if not pid.isdigit():
+                continue
+            try:
+                with open(f'/proc/{pid}/cmdline', 'rb') as f:
+                    args = f.read().split(b'\0')
+            except OSError:
+                continue  # Process exited or is not readable
+            
+            if not any(b'pytivo' in arg.lower() for arg in args):
+                continue
+            for flag, value in zip(args, args[1:]):
+                if flag == b'-c' and value.endswith(b'.conf'):
+                    return os.fsdecode(value)
+        return None
+    
+    def _find_config_in_ps(self):
+        """Scan ps output for a pytivo process started with -c <file>.conf."""
+        # Raw bytes: only the matched path is ever decoded
+        result = subprocess.run(['ps', 'aux'], capture_output=True)
+        for line in result.stdout.splitlines():
+            # _PS_CONFIG_RE needs a literal '.conf', so test that first and
+            # only lowercase the few lines that have one
+            if b'.conf' not in line or b'pytivo' not in line.lower():
+                continue
+            # Look for -c flag followed by config path
+            match = _PS_CONFIG_RE.search(line)
+            if match:
+                return os.fsdecode(match.group(1))
+        return None
+    
     def get_log_file_path(self):
-        """Get log file path from pyTivo config."""
+        """Get log file path from pyTivo config (cached once found)."""
+        if self._cached_log_path:
+            return self._cached_log_path
+        
         config_path = self.get_pytivo_config_path()
         if not config_path:
             print("Could not find pyTivo config file from running process")
@@ -1127,21 +1535,72 @@ class PyTivoAutomation:
         print(f"Found config: {config_path}")
         
         try:
-            with open(config_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('log_file'):
-                        # Parse: log_file = /path/to/log
-                        match = re.search(r'log_file\s*=\s*(.+)', line)
-                        if match:
-                            log_path = match.group(1).strip()
-                            print(f"Found log file: {log_path}")
-                            return log_path
+            config = self._get_pytivo_config()
+            # log_file normally lives in [Server], but take it from anywhere
+            # (a DEFAULT log_file is already merged into every section)
+            for section in config:
+                log_path = config[section].get('log_file', '')
+                if log_path:
+                    print(f"Found log file: {log_path}")
+                    self._cached_log_path = log_path
+                    return log_path
         except Exception as e:
             print(f"Error reading config: {e}")
         
         return None
     
+    def _get_pytivo_config(self, config_path: str = None):
+        """
+        Parse a pyTivo config file, by default the running pyTivo's.
+        
+        Each file's parse is kept and reused until its mtime changes.
+        
+        Args:
+            config_path: Config file to parse (default: get_pytivo_config_path())
+        
+        Returns:
+            Dict of {section: {key: value}}, see _parse_pytivo_conf
+        
+        Raises:
+            OSError: If the config file cannot be found or read
+        """
+        if config_path is None:
+            config_path = self.get_pytivo_config_path()
+        if not config_path:
+            raise FileNotFoundError("pyTivo config not found")
+        
+        mtime = os.stat(config_path).st_mtime
+        cached = self._pytivo_configs.get(config_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        with open(config_path, 'r') as f:
+            config = _parse_pytivo_conf(f.read())
+        self._pytivo_configs[config_path] = (mtime, config)
+        return config
+    
+    def _get_share_paths(self):
+        """
+        Map the running pyTivo's share sections to their paths.
+        
+        The map is rebuilt only when _get_pytivo_config re-parses the file.
+        
+        Returns:
+            Dict of {section: path} for every section with a path, other
+            than _tivo_SD, _tivo_HD and Server
+        
+        Raises:
+            OSError: If the config file cannot be found or read
+        """
+        config = self._get_pytivo_config()
+        if self._share_paths is None or self._share_paths[0] is not config:
+            paths = {}
+            for section, options in config.items():
+                if section not in ['_tivo_SD', '_tivo_HD', 'Server'] and options.get('path'):
+                    paths[section] = options['path']
+            self._share_paths = (config, paths)
+        return self._share_paths[1]
+    
     def monitor_transfer(self, timeout_minutes=30, remove_after=False):
         """
         Monitor log file for transfer completion.
@@ -1158,51 +1617,50 @@ class PyTivoAutomation:
             print("Cannot monitor transfer - log file not found")
             return (False, None)
         
-        if not os.path.exists(log_path):
+        tailer = self.get_log_tailer(log_path)
+        if not tailer:
             print(f"Log file does not exist: {log_path}")
             return (False, None)
         
         print(f"\nMonitoring log file: {log_path}")
         print("Waiting for 'Start sending' message...")
         
-        # Get current position in log file
-        with open(log_path, 'r') as f:
-            f.seek(0, 2)  # Seek to end
-            start_pos = f.tell()
+        # Only a transfer that starts from here on counts; earlier users
+        # of the shared tailer may have left it behind older lines
+        tailer.seek_end()
         
-        start_time = time.time()
         transfer_started = False
-        last_progress_time = start_time
+        last_progress_time = time.monotonic()
         transferred_file = None
         
-        while (time.time() - start_time) < (timeout_minutes * 60):
+        for chunk in tailer.follow(timeout_minutes * 60):
             try:
-                with open(log_path, 'r') as f:
-                    f.seek(start_pos)
-                    new_lines = f.readlines()
-                    start_pos = f.tell()
+                progress_seen = False
                 
-                for line in new_lines:
-                    line = line.strip()
+                # One regex pass over the block picks out the marker lines;
+                # every other line is skipped without any Python-level work
+                for marker in _MARKER_LINE_RE.finditer(chunk):
+                    kind = marker.group(1)
+                    line = marker.group().decode('utf-8', 'replace')
                     
                     # Check for start of transfer
-                    if 'Start sending' in line:
+                    if kind == b'Start sending':
                         transfer_started = True
                         print(f"\n✓ Transfer started!")
-                        print(f"  {line}")
+                        print(f"  {line.strip()}")
                         # Extract filename: Start sending "filename" to ...
-                        match = re.search(r'Start sending "([^"]+)"', line)
+                        match = _START_RE.search(line)
                         if match:
                             transferred_file = match.group(1)
-                        last_progress_time = time.time()
+                        last_progress_time = time.monotonic()
                     
                     # Check for completion
-                    elif 'Done sending' in line:
+                    elif kind == b'Done sending':
                         print(f"\n✓ Transfer completed!")
-                        print(f"  {line}")
+                        print(f"  {line.strip()}")
                         # Also try to extract filename from Done message if we don't have it
                         if not transferred_file:
-                            match = re.search(r'Done sending "([^"]+)"', line)
+                            match = _DONE_RE.search(line)
                             if match:
                                 transferred_file = match.group(1)
                         
@@ -1212,15 +1670,18 @@ class PyTivoAutomation:
                         
                         return (True, transferred_file)
                     
-                    # Show other relevant messages
-                    elif transfer_started and ('Mb/s' in line or 'bytes' in line):
-                        # Progress indicator
-                        elapsed = int(time.time() - last_progress_time)
-                        if elapsed >= 10:  # Show update every 10 seconds
-                            print(f"  Transfer in progress... ({elapsed}s)")
-                            last_progress_time = time.time()
+                    # Progress indicator ('Mb/s' or 'bytes')
+                    elif transfer_started:
+                        progress_seen = True
                 
-                time.sleep(1)
+                # The progress gate is checked once per poll, not per line
+                if progress_seen:
+                    elapsed = int(time.monotonic() - last_progress_time)
+                    if elapsed >= 10:  # Show update every 10 seconds
+                        print(f"  Transfer in progress... ({elapsed}s)")
+                        last_progress_time = time.monotonic()
+                
+                sys.stdout.flush()
                 
             except Exception as e:
                 print(f"Error reading log: {e}")
@@ -1255,50 +1716,28 @@ class PyTivoAutomation:
                 return False
         
         # Otherwise, search all share sections for the file
-        config_path = self.get_pytivo_config_path()
-        if not config_path:
+        if not self.get_pytivo_config_path():
             print(f"Cannot find file - config not found")
             return False
         
         try:
-            with open(config_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Find all share sections and their paths
-            current_section = None
             basename = os.path.basename(filename)
             
-            for line in lines:
-                stripped = line.strip()
-                
-                # Track section headers
-                if stripped.startswith('[') and stripped.endswith(']'):
-                    current_section = stripped[1:-1]
-                    continue
-                
-                # Skip non-share sections
-                if not current_section or current_section in ['_tivo_SD', '_tivo_HD', 'Server']:
-                    continue
-                
-                # Look for path= in share sections
-                if stripped.lower().startswith('path'):
-                    match = re.search(r'path\s*=\s*(.+)', stripped, re.IGNORECASE)
-                    if match:
-                        share_path = match.group(1).strip()
-                        # Try to find file in this share
-                        potential_file = os.path.join(share_path, basename)
-                        if os.path.exists(potential_file):
-                            try:
-                                if os.path.islink(potential_file):
-                                    os.unlink(potential_file)  # Remove symlink only
-                                    print(f"  ✓ Deleted symlink from [{current_section}]: {potential_file}")
-                                else:
-                                    os.remove(potential_file)  # Remove regular file
-                                    print(f"  ✓ Deleted from [{current_section}]: {potential_file}")
-                                return True
-                            except Exception as e:
-                                print(f"  ✗ Error deleting file: {e}")
-                                return False
+            for section, share_path in self._get_share_paths().items():
+                # Try to find file in this share
+                potential_file = os.path.join(share_path, basename)
+                if os.path.exists(potential_file):
+                    try:
+                        if os.path.islink(potential_file):
+                            os.unlink(potential_file)  # Remove symlink only
+                            print(f"  ✓ Deleted symlink from [{section}]: {potential_file}")
+                        else:
+                            os.remove(potential_file)  # Remove regular file
+                            print(f"  ✓ Deleted from [{section}]: {potential_file}")
+                        return True
+                    except Exception as e:
+                        print(f"  ✗ Error deleting file: {e}")
+                        return False
             
             print(f"  ✗ File '{basename}' not found in any share directories")
             return False
@@ -1637,64 +2076,94 @@ class PyTivoAutomation:
         
         print("=" * 60)
         
+        def jump_to_top():
+            self.nav.jump_to_top()
+            print("Jumped to top of list")
+        
+        def jump_to_bottom():
+            self.nav.jump_to_bottom()
+            print("Jumped to bottom of list")
+        
+        def select_position(arg):
+            try:
+                pos = int(arg)
+            except ValueError:
+                print("Invalid position number")
+                return
+            self.select_video_by_position(pos)
+        
+        def list_sequences():
+            if self.nav_sequences:
+                print("\nAvailable sequences:")
+                for seq_name in sorted(self.nav_sequences.keys()):
+                    print(f"  {seq_name}")
+            else:
+                print("No sequences loaded from config")
+        
+        def reload_config():
+            # Reload navigation config and rediscover pyTivo paths
+            if self._nav_config_searched:
+                self.nav_config = self._find_nav_config(refresh=True)
+            sequences = self.load_navigation_config()
+            self._find_pytivo_config(refresh=True)
+            self._cached_config_path = None
+            self._cached_log_path = None
+            if sequences is self.nav_sequences:
+                print("Navigation config unchanged")
+            else:
+                self.nav_sequences = sequences
+                print("Navigation config reloaded")
+        
+        # Hotkeys take precedence over config sequences of the same name;
+        # the remaining commands can be overridden by a sequence
+        hotkeys = {
+            'u': lambda: self.remote.press(TiVoButton.UP),
+            'd': lambda: self.remote.press(TiVoButton.DOWN),
+            'l': lambda: self.remote.press(TiVoButton.LEFT),
+            'r': lambda: self.remote.press(TiVoButton.RIGHT),
+            's': lambda: self.remote.press(TiVoButton.SELECT),
+            'h': self.nav.go_home,
+            'm': self.nav.go_to_my_shows,
+        }
+        commands = {
+            'b': lambda: self.remote.press(TiVoButton.LEFT),  # Back is often LEFT
+            'p': lambda: self.remote.press(TiVoButton.PLAY),
+            'i': lambda: self.remote.press(TiVoButton.INFO),
+            'top': jump_to_top,
+            'bottom': jump_to_bottom,
+            'list': list_sequences,
+            'reload': reload_config,
+        }
+        # Commands taking an argument: "search <text>", "pos <n>"
+        arg_commands = {
+            'search': self.search_for_video,
+            'pos': select_position,
+        }
+        
         while True:
-            cmd = input("\nCommand: ").strip().lower()
+            line = input("\nCommand: ").strip()
+            cmd = line.lower()
             
             if cmd == 'q':
                 break
-            elif cmd == 'u':
-                self.remote.press(TiVoButton.UP)
-            elif cmd == 'd':
-                self.remote.press(TiVoButton.DOWN)
-            elif cmd == 'l':
-                self.remote.press(TiVoButton.LEFT)
-            elif cmd == 'r':
-                self.remote.press(TiVoButton.RIGHT)
-            elif cmd == 's':
-                self.remote.press(TiVoButton.SELECT)
-            elif cmd == 'h':
-                self.nav.go_home()
-            elif cmd == 'm':
-                self.nav.go_to_my_shows()
+            
+            action = hotkeys.get(cmd)
+            if action:
+                action()
             elif cmd in self.nav_sequences:
                 # Execute sequence from config file
                 if not self.execute_sequence(cmd):
                     print(f"✗ Failed to execute sequence: {cmd}")
-            elif cmd == 'b':
-                self.remote.press(TiVoButton.LEFT)  # Back is often LEFT
-            elif cmd == 'p':
-                self.remote.press(TiVoButton.PLAY)
-            elif cmd == 'i':
-                self.remote.press(TiVoButton.INFO)
-            elif cmd == 'top':
-                self.nav.jump_to_top()
-                print("Jumped to top of list")
-            elif cmd == 'bottom':
-                self.nav.jump_to_bottom()
-                print("Jumped to bottom of list")
-            elif cmd.startswith('search '):
-                search_term = cmd[7:]
-                self.search_for_video(search_term)
-            elif cmd.startswith('pos '):
-                try:
-                    pos = int(cmd[4:])
-                    self.select_video_by_position(pos)
-                except ValueError:
-                    print("Invalid position number")
-            elif cmd == 'list':
-                # List available sequences
-                if self.nav_sequences:
-                    print("\nAvailable sequences:")
-                    for seq_name in sorted(self.nav_sequences.keys()):
-                        print(f"  {seq_name}")
-                else:
-                    print("No sequences loaded from config")
-            elif cmd == 'reload':
-                # Reload navigation config
-                self.nav_sequences = self.load_navigation_config()
-                print("Navigation config reloaded")
             else:
-                print(f"Unknown command: {cmd}")
+                # Arguments keep their case, e.g. search terms
+                verb, _, arg = line.partition(' ')
+                verb = verb.lower()
+                if arg and verb in arg_commands:
+                    arg_commands[verb](arg)
+                elif cmd in commands:
+                    commands[cmd]()
+                else:
+                    print(f"Unknown command: {cmd}")
 
 
 def main():
@@ -109,6 +109,13 @@ def get_zc():
 
     return True
 
+def get_zc_timeout():
+    """ How long to wait for each TiVo's Zeroconf details, in ms. """
+    try:
+        return max(int(get_server('zeroconf_timeout', '3000')), 1)
+    except ValueError:
+        return 3000
+
 def getBeaconAddresses():
     return get_server('beacon', '255.255.255.255')
 
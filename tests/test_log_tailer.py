@@ -0,0 +1,89 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pytivo_transfer import LogTailer
+
+
+class LogTailerTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'pyTivo.log')
+        self.write('old line\n', 'w')
+        self.tailer = LogTailer(self.path)
+
+    def tearDown(self):
+        self.tailer.close()
+        shutil.rmtree(self.dir)
+
+    def write(self, text, mode='a'):
+        with open(self.path, mode) as f:
+            f.write(text)
+
+    def test_starts_at_end(self):
+        self.assertEqual(self.tailer.read_chunk(), b'')
+        self.write('new line\n')
+        self.assertEqual(self.tailer.read_chunk(), b'new line\n')
+
+    def test_partial_line_is_carried(self):
+        self.write('first\nsec')
+        self.assertEqual(self.tailer.read_chunk(), b'first\n')
+        self.assertEqual(self.tailer.tell(), len('old line\nfirst\n'))
+        self.write('ond\n')
+        self.assertEqual(self.tailer.read_chunk(), b'second\n')
+
+    def test_seek_rereads_from_offset(self):
+        start = self.tailer.tell()
+        self.write('a\nb\n')
+        self.assertEqual(self.tailer.read_chunk(), b'a\nb\n')
+        self.tailer.seek(start)
+        self.assertEqual(self.tailer.read_chunk(), b'a\nb\n')
+
+    def test_seek_end_drops_partial_line(self):
+        self.write('skipped\npart')
+        self.tailer.seek_end()
+        self.write('ial\nkept\n')
+        self.assertEqual(self.tailer.read_chunk(), b'ial\nkept\n')
+
+    def test_truncation_restarts_from_start(self):
+        self.write('x' * 50 + '\n')
+        self.tailer.read_chunk()
+        self.write('short\n', 'w')
+        self.assertEqual(self.tailer.read_chunk(), b'short\n')
+
+    def test_rotation_follows_new_file(self):
+        self.write('before\n')
+        self.assertEqual(self.tailer.read_chunk(), b'before\n')
+        os.rename(self.path, self.path + '.1')
+        self.write('after\n', 'w')
+        self.assertEqual(self.tailer.read_chunk(), b'after\n')
+        self.write('more\n')
+        self.assertEqual(self.tailer.read_chunk(), b'more\n')
+
+    def test_rotation_waits_for_new_file(self):
+        os.rename(self.path, self.path + '.1')
+        self.assertEqual(self.tailer.read_chunk(), b'')
+        self.assertTrue(self.tailer.orphaned)
+        self.write('after\n', 'w')
+        self.assertEqual(self.tailer.read_chunk(), b'after\n')
+        self.assertFalse(self.tailer.orphaned)
+
+    def test_rotation_keeps_old_file_if_new_cannot_be_opened(self):
+        old_fd = self.tailer.fd
+        os.rename(self.path, self.path + '.1')
+        self.write('after\n', 'w')
+
+        with mock.patch('os.open', side_effect=PermissionError):
+            self.assertEqual(self.tailer.read_chunk(), b'')
+        self.assertEqual(self.tailer.fd, old_fd)
+
+        self.assertEqual(self.tailer.read_chunk(), b'after\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
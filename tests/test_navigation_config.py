@@ -0,0 +1,107 @@
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pytivo_transfer import PyTivoAutomation
+from tivo_remote import TiVoButton
+
+
+NAV_CONFIG = '''# comment
+UP 0.5
+
+[Devices]
+# Navigate to Devices & Messages screen
+TIVO 0.5
+select 0.25
+BOTTOM 0.5
+WAIT_FOR "Start sending"
+LOCATE_SHARE "Movies"
+
+[transfer]
+TRANSFER_ALL
+DELETE_SOURCE_FILE
+
+[delete]
+DELETE_SOURCE_FILE
+
+[bad]
+WAIT_FOR
+NOSUCHBUTTON 0.5
+UP soon
+
+[empty]
+'''
+
+
+class NavigationConfigTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'tivo_navigation.txt')
+        self.write(NAV_CONFIG)
+        self.output = io.StringIO()
+        with redirect_stdout(self.output):
+            self.automation = PyTivoAutomation('tivo.invalid', nav_config=self.path)
+        self.sequences = self.automation.nav_sequences
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def write(self, text):
+        with open(self.path, 'w') as f:
+            f.write(text)
+
+    def test_section_names_lowercased_and_empty_dropped(self):
+        # Steps before the first header are discarded too
+        self.assertEqual(sorted(self.sequences), ['delete', 'devices', 'transfer'])
+
+    def test_steps_are_compiled(self):
+        a = self.automation
+        steps = self.sequences['devices']
+        self.assertEqual(steps[0], (a._step_nav, a.nav.go_home))
+        press, delay = steps[1]
+        self.assertEqual(press.func, a.remote.press)
+        self.assertEqual(press.args, (TiVoButton.SELECT,))
+        self.assertEqual(delay, 0.25)
+        self.assertEqual(steps[2], (a._step_nav, a.nav.jump_to_bottom))
+        self.assertEqual(steps[3], (a._step_wait_for, 'Start sending'))
+        self.assertEqual(steps[4], (a._step_locate_share, 'Movies'))
+        self.assertEqual(len(steps), 5)
+
+    def test_delete_after_transfer_all_is_folded(self):
+        a = self.automation
+        self.assertEqual(self.sequences['transfer'], [(a._step_transfer_all, True)])
+        self.assertEqual(self.sequences['delete'], [(a._step_delete_source_file, None)])
+
+    def test_invalid_lines_are_reported_and_skipped(self):
+        self.assertNotIn('bad', self.sequences)
+        output = self.output.getvalue()
+        self.assertIn('Invalid WAIT_FOR syntax', output)
+        self.assertIn("Unknown button 'NOSUCHBUTTON'", output)
+        self.assertIn('Invalid delay', output)
+
+    def test_unchanged_file_is_not_reparsed(self):
+        self.assertIs(self.automation.load_navigation_config(), self.sequences)
+
+    def test_changed_file_is_reparsed(self):
+        self.write('[other]\nUP 0.5\n')
+        self.assertEqual(list(self.automation.load_navigation_config()), ['other'])
+
+    def test_reload_after_failure_reparses(self):
+        os.remove(self.path)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(self.automation.load_navigation_config(), {})
+        self.write(NAV_CONFIG)
+        with redirect_stdout(io.StringIO()):
+            sequences = self.automation.load_navigation_config()
+        self.assertIsNot(sequences, self.sequences)
+        self.assertEqual(sorted(sequences), sorted(self.sequences))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pytivo_transfer import _parse_pytivo_conf
+
+
+class ParsePytivoConfTest(unittest.TestCase):
+    def test_equals_separator(self):
+        config = _parse_pytivo_conf('[Server]\nlog_file = /var/log/p.log\n'
+                                    '[Movies]\ntype = video\npath = /x\n')
+        self.assertEqual(config['Server']['log_file'], '/var/log/p.log')
+        self.assertEqual(config['Movies'], {'type': 'video', 'path': '/x'})
+
+    def test_colon_separator(self):
+        config = _parse_pytivo_conf('[Server]\nlog_file: /var/log/p.log\n')
+        self.assertEqual(config, {'Server': {'log_file': '/var/log/p.log'}})
+
+    def test_indented_key(self):
+        config = _parse_pytivo_conf('[S]\n  path = /x\n')
+        self.assertEqual(config, {'S': {'path': '/x'}})
+
+    def test_keys_lowercased_and_defaults_merged(self):
+        config = _parse_pytivo_conf('[DEFAULT]\nLog_File = /l\n[S]\nPath = /x\n')
+        self.assertEqual(config, {'S': {'log_file': '/l', 'path': '/x'}})
+
+    def test_interpolation_matches_pytivo(self):
+        config = _parse_pytivo_conf('[DEFAULT]\nbase = /m\n[S]\npath = %(base)s/x\n')
+        self.assertEqual(config['S']['path'], '/m/x')
+
+
+if __name__ == '__main__':
+    unittest.main()
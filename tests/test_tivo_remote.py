@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tivo_remote import TiVoRemote, TiVoButton
+
+
+class FakeSocket:
+    def __init__(self):
+        self.writes = []
+
+    def sendall(self, data):
+        self.writes.append(bytes(data))
+
+    def close(self):
+        pass
+
+
+class TiVoRemoteTest(unittest.TestCase):
+    def setUp(self):
+        self.remote = TiVoRemote('tivo.invalid')
+        self.sock = self.remote.socket = FakeSocket()
+
+    def test_press_sends_ircode(self):
+        self.remote.press(TiVoButton.UP, delay=0)
+        self.assertEqual(self.sock.writes, [b'IRCODE UP\r\n'])
+
+    def test_pipeline_defers_zero_delay_presses(self):
+        with self.remote.pipeline():
+            self.remote.press(TiVoButton.UP, delay=0)
+            self.remote.press(TiVoButton.DOWN, delay=0)
+            self.assertEqual(self.sock.writes, [])
+        self.assertEqual(self.sock.writes, [b'IRCODE UP\r\nIRCODE DOWN\r\n'])
+
+    def test_pipeline_pending_goes_out_before_next_command(self):
+        with self.remote.pipeline():
+            self.remote.press(TiVoButton.UP, delay=0)
+            self.remote.send_command('TELEPORT TIVO')
+            self.assertEqual(self.sock.writes,
+                             [b'IRCODE UP\r\nTELEPORT TIVO\r\n'])
+        self.assertEqual(len(self.sock.writes), 1)
+
+    def test_flush_sends_pending_once(self):
+        with self.remote.pipeline():
+            self.remote.press(TiVoButton.LEFT, delay=0)
+            self.assertTrue(self.remote.flush())
+            self.assertTrue(self.remote.flush())
+        self.assertEqual(self.sock.writes, [b'IRCODE LEFT\r\n'])
+
+    def test_press_sequence_keeps_order_with_pending(self):
+        with self.remote.pipeline():
+            self.remote.press(TiVoButton.SELECT, delay=0)
+            self.remote.press_sequence([TiVoButton.DOWN, TiVoButton.DOWN], delay=0)
+        self.assertEqual(self.sock.writes, [
+            b'IRCODE SELECT\r\n',
+            b'IRCODE DOWN\r\nIRCODE DOWN\r\n',
+        ])
+
+    def test_press_n(self):
+        self.remote.press_n(TiVoButton.RIGHT, 3, delay=0)
+        self.assertEqual(b''.join(self.sock.writes), b'IRCODE RIGHT\r\n' * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
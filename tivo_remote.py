@@ -11,6 +11,7 @@ https://www.tivo.com/assets/images/abouttivo/resources/downloads/brochures/TiVo_
 
 import socket
 import time
+from contextlib import contextmanager
 from typing import Optional, List
 from enum import Enum
 
@@ -68,6 +69,9 @@ class TiVoButton(Enum):
     ACTION_C = "ACTION_C"  # Red (C)
     ACTION_D = "ACTION_D"  # Green (D)
 
+# Wire bytes for each button, encoded once rather than on every press
+_IRCODES = {button: f"IRCODE {button.value}\r\n".encode('utf-8') for button in TiVoButton}
+
 class TiVoRemote:
     """Control a TiVo via Network Remote Control."""
     
@@ -84,6 +88,7 @@ class TiVoRemote:
         self.port = port
         self.timeout = timeout
         self.socket: Optional[socket.socket] = None
+        self._pending: Optional[List[bytes]] = None  # Set inside pipeline()
         
     def connect(self) -> bool:
         """Connect to the TiVo."""
@@ -115,15 +120,25 @@ class TiVoRemote:
         Returns:
             True if command sent successfully
         """
+        return self._send(f"{command}\r\n".encode('utf-8'))
+    
+    def _send(self, data: bytes) -> bool:
+        """Send one encoded command line, after any deferred pipeline presses."""
         if not self.socket:
             if not self.connect():
                 return False
         
+        command = data
+        if self._pending:
+            # Deferred pipeline presses go out in the same write, in order
+            data = b''.join(self._pending) + data
+            self._pending.clear()
+        
         try:
-            self.socket.sendall(f"{command}\r\n".encode('utf-8'))
+            self.socket.sendall(data)
             return True
         except socket.error as e:
-            print(f"Failed to send command '{command}': {e}")
+            print(f"Failed to send command '{command.decode('utf-8', 'replace').strip()}': {e}")
             self.disconnect()
             return False
     
@@ -138,11 +153,109 @@ class TiVoRemote:
         Returns:
             True if successful
         """
-        result = self.send_command(f"IRCODE {button.value}")
+        if self._pending is not None and delay <= 0:
+            # Nothing to wait for, so let it ride along with the next write
+            self._pending.append(_IRCODES[button])
+            return True
+        result = self._send(_IRCODES[button])
         if result and delay > 0:
             time.sleep(delay)
         return result
     
+    def press_n(self, button: TiVoButton, count: int, delay: float = 0.3) -> bool:
+        """
+        Press the same button several times.
+        
+        Args:
+            button: Button to press
+            count: Number of presses
+            delay: Delay after each press (seconds)
+            
+        Returns:
+            True if all presses were sent
+        """
+        return self.press_sequence([button] * count, delay=delay)
+    
+    def press_sequence(self, buttons, delay: float = 0.3) -> bool:
+        """
+        Press several buttons in order.
+        
+        The connection is checked once up front, so each press is just a
+        send of its pre-encoded command and the pacing delay. With no
+        delay the whole sequence goes out in a single write.
+        
+        Args:
+            buttons: Buttons to press, in order
+            delay: Delay after each press (seconds)
+            
+        Returns:
+            True if all presses were sent
+        """
+        payloads = [_IRCODES[button] for button in buttons]
+        if not payloads:
+            return True
+        if not self.socket:
+            if not self.connect():
+                return False
+        if not self.flush():  # Keep order with deferred pipeline presses
+            return False
+        
+        if delay <= 0:
+            payloads = [b''.join(payloads)]
+        try:
+            for payload in payloads:
+                self.socket.sendall(payload)
+                if delay > 0:
+                    time.sleep(delay)
+            return True
+        except socket.error as e:
+            print(f"Failed to send button sequence: {e}")
+            self.disconnect()
+            return False
+    
+    def flush(self) -> bool:
+        """
+        Send any presses deferred by pipeline().
+        
+        Returns:
+            True if nothing was pending or the send succeeded
+        """
+        if not self._pending:
+            return True
+        if not self.socket:
+            if not self.connect():
+                return False
+        
+        data = b''.join(self._pending)
+        self._pending.clear()
+        try:
+            self.socket.sendall(data)
+            return True
+        except socket.error as e:
+            print(f"Failed to send pipelined commands: {e}")
+            self.disconnect()
+            return False
+    
+    @contextmanager
+    def pipeline(self):
+        """
+        Batch presses that have no delay into the next socket write.
+        
+        Inside the block, press() with delay <= 0 is queued rather than
+        sent, and goes out together with the next command that is sent.
+        Anything still queued is flushed when the block exits; call
+        flush() before waiting on something other than a press.
+        """
+        outer = self._pending is not None
+        if not outer:
+            self._pending = []
+        try:
+            yield self
+        finally:
+            if not outer:
+                self.flush()
+                self._pending = None
+    
     def press_multiple(self, buttons: List[TiVoButton], delay: float = 0.3) -> bool:
         """
         Press multiple buttons in sequence.
@@ -240,8 +353,7 @@ class TiVoNavigator:
         """
         # Press UP repeatedly to get to top
         # Most TiVo lists aren't deeper than 50 items
-        for _ in range(max_presses):
-            self.remote.press(TiVoButton.UP, delay=0.1)
+        self.remote.press_n(TiVoButton.UP, max_presses, delay=0.1)
         time.sleep(0.3)
     
     def jump_to_bottom(self, max_presses: int = 50):
@@ -252,8 +364,7 @@ class TiVoNavigator:
             max_presses: Maximum number of DOWN presses to send
         """
         # Press DOWN repeatedly to get to bottom
-        for _ in range(max_presses):
-            self.remote.press(TiVoButton.DOWN, delay=0.1)
+        self.remote.press_n(TiVoButton.DOWN, max_presses, delay=0.1)
         time.sleep(0.3)
     
     def navigate_to_pytivo_share(self, share_name: str, from_my_shows: bool = True) -> bool:
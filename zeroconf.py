@@ -1411,7 +1411,9 @@ class Zeroconf(object):
     def updateRecord(self, now, rec):
         """Used to notify listeners of new information that has updated
         a record."""
-        for listener in self.listeners:
+        # Iterate over a copy: getServiceInfo lookups running in other
+        # threads add and remove their listeners while we notify
+        for listener in list(self.listeners):
             listener.updateRecord(self, now, rec)
         self.notifyAll()
 